@@ -0,0 +1,109 @@
+import pygame
+
+
+class FrameAnimation:
+    """
+    A sequence of images shown at one position, each for its own duration.
+    Frames with a duration of 0 are skipped, like the entries of
+    game_tools.frame_durations.
+    """
+
+    def __init__(self, frames, pos, durations=None, default_duration=16, modal=False, on_finish=None):
+        """
+        :param frames: list of pygame.Surface
+        :param pos: top left (x, y) of every frame
+        :param durations: dict frame index -> milliseconds, missing frames use default_duration
+        :param modal: the game should ignore player input while this plays
+        :param on_finish: called once when the last frame has been shown
+        """
+        durations = durations or {}
+        self.frames = [(frame, durations.get(index, default_duration)) for index, frame in enumerate(frames)
+                       if durations.get(index, default_duration) != 0]
+        self.pos = pos
+        self.modal = modal
+        self.on_finish = on_finish
+        self.length = sum(duration for _, duration in self.frames)
+        self.then = None
+        self.start_time = None
+
+    def followed_by(self, animation):
+        """Plays animation once this one finishes. :return: animation, for chaining"""
+        self.then = animation
+        return animation
+
+    def finished(self, now) -> bool:
+        return now - self.start_time >= self.length
+
+    def draw(self, scrn, now):
+        elapsed = now - self.start_time
+        for frame, duration in self.frames:
+            if elapsed < duration:
+                scrn.blit(frame, self.pos)
+                return
+            elapsed -= duration
+        scrn.blit(self.frames[-1][0], self.pos)
+
+
+class FadeIn(FrameAnimation):
+    """Fades an image in from black over duration milliseconds."""
+
+    def __init__(self, image, pos, duration, modal=False, on_finish=None):
+        super().__init__([image], pos, {0: duration}, modal=modal, on_finish=on_finish)
+        self.image = image
+        self.shade = pygame.Surface(image.get_size())
+        self.shade.fill((0, 0, 0))
+
+    def draw(self, scrn, now):
+        scrn.blit(self.image, self.pos)
+        alpha = 255 - 255 * min((now - self.start_time) / self.length, 1.0) if self.length else 0
+        self.shade.set_alpha(int(alpha))
+        scrn.blit(self.shade, self.pos)
+
+
+class Timeline:
+    """
+    Plays animations on top of the running game. update() is called once per
+    frame from the main loop: it draws the current frame of every active
+    animation and retires the finished ones, so nothing waits or spins.
+    """
+
+    def __init__(self):
+        self.active = []
+
+    def play(self, animation, now):
+        """
+        Starts an animation (and whatever it is followed by)
+        :param now: current time in milliseconds
+        :return: the animation
+        """
+        animation.start_time = now
+        self.active.append(animation)
+        return animation
+
+    @property
+    def modal(self) -> bool:
+        """True while an animation that should block player input is playing."""
+        return any(animation.modal for animation in self.active)
+
+    def update(self, scrn, now):
+        """
+        Advances and draws every active animation, oldest first
+        :param scrn: pygame.Surface or None to only advance time
+        :param now: current time in milliseconds
+        :return: none
+        """
+        for animation in self.active[:]:
+            if animation.finished(now):
+                self.active.remove(animation)
+                if animation.on_finish is not None:
+                    animation.on_finish()
+                if animation.then is None:
+                    continue
+                animation = self.play(animation.then, animation.start_time + animation.length)
+                if animation.finished(now):
+                    continue
+            if scrn is not None:
+                animation.draw(scrn, now)
+
+    def clear(self):
+        self.active.clear()
@@ -0,0 +1,124 @@
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+import game_tools
+import inputs
+
+# scene -> assets it needs before it is shown. Music is streamed by mixer.music and not listed.
+MANIFEST = {"menu": ["assets/menu_background.png", "assets/mainmenu_play.png", "assets/mainmenu_quit.png",
+                     "assets/mainmenu_logo.png", "assets/mainmenu_play_hovered.png",
+                     "assets/mainmenu_quit_hovered.png", "assets/button_press.mp3"],
+            "play": ["assets/play_screen.png", "assets/play_newgame.png", "assets/play_resumegame.png",
+                     "assets/play_options.png", "assets/play_resumegame_unavailable.png",
+                     "assets/play_newgame_hovered.png", "assets/play_resumegame_pressed.png",
+                     "assets/play_options_pressed.png"],
+            "map": ["assets/house_map_baselayer.png", "assets/house_illegal_regions.png",
+                    "assets/playbutton.png", "assets/playbutton_unavail.png", "assets/tower_select.png",
+                    "assets/mrcheese_text.png", "assets/ratcamp_text.png", "assets/ozbourne_text.png",
+                    "assets/upgrade_window.png", "assets/upgrade_window_highlighted.png", "assets/sell_button.png",
+                    "assets/upgrade_booksmart.png", "assets/upgrade_protein.png", "assets/upgrade_diploma.png",
+                    "assets/upgrade_culture_injection.png", "assets/upgrade_fasterrats.png",
+                    "assets/upgrade_strongerrats.png", "assets/upgrade_longerriffs.png",
+                    "assets/upgrade_amplifier.png",
+                    "assets/base_rat.png", "assets/mrcheese_booksmart.png", "assets/mrcheese_protein.png",
+                    "assets/mrcheese_diploma.png", "assets/mrcheese_steroids.png",
+                    "assets/mrcheese_booksmart+protein.png", "assets/mrcheese_diploma+protein.png",
+                    "assets/mrcheese_steroids+booksmart.png", "assets/projectile_cheese.png",
+                    "assets/base_camp.png", "assets/camp_faster.png", "assets/camp_stronger.png",
+                    "assets/camp_stronger+faster.png", "assets/rat_recruit.png", "assets/rat_recruit_faster.png",
+                    "assets/rat_recruit_stronger.png", "assets/rat_recruit_stronger+faster.png",
+                    "assets/splatter_recuit.png",
+                    "assets/alfredo_ozbourne_base.png", "assets/alfredo_ozbourne_amplifier.png",
+                    "assets/alfredo_ozbourne_longer_riffs.png", "assets/alfredo_ozbourne_longer_riffs+amplifier.png",
+                    "assets/ant_base.png", "assets/hornet_base.png", "assets/centipede_head.png",
+                    "assets/centipede_link.png", "assets/centipede_tail.png", "assets/splatter.png",
+                    "assets/splat_sfx.mp3", "assets/purchase_sound.mp3", "assets/tower_placed.mp3",
+                    "assets/riff1.mp3", "assets/riff_longer.mp3"] + game_tools.SPLASH_FRAMES,
+            # only needed once the cutscene triggers, loaded in the background during play
+            "mog": game_tools.MOG_FRAMES + ["assets/mog_song.mp3"]}
+
+
+class AssetLoader:
+    """
+    Decodes the files a scene needs on a thread pool. Finished files are
+    handed to the game_tools caches from the main thread in poll(), where
+    images are converted to the display format, so load_image and load_sound
+    find them already decoded.
+    """
+
+    def __init__(self, workers=4):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.pending = {}  # path -> Future
+        self.total = 0
+        self.finished = 0
+
+    def request(self, scene):
+        """
+        Queues every asset of a scene that isn't cached or queued yet
+        :param scene: key of MANIFEST
+        :return: none
+        """
+        for path in MANIFEST[scene]:
+            if path not in self.pending and not game_tools.is_cached(path):
+                self.pending[path] = self.pool.submit(game_tools.decode_asset, path)
+                self.total += 1
+
+    def poll(self) -> int:
+        """
+        Moves decoded assets into the caches. Called from the main thread.
+        :return: int, number of assets still loading
+        """
+        for path, future in list(self.pending.items()):
+            if future.done():
+                asset = future.result()
+                if not game_tools.is_cached(path):  # load_image may have needed it first
+                    game_tools.cache_asset(path, asset)
+                del self.pending[path]
+                self.finished += 1
+        return len(self.pending)
+
+    def ready(self, scene) -> bool:
+        return all(game_tools.is_cached(path) for path in MANIFEST[scene])
+
+    def progress(self, scene) -> float:
+        """Fraction of a scene's assets that are decoded and cached."""
+        return sum(game_tools.is_cached(path) for path in MANIFEST[scene]) / len(MANIFEST[scene])
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def draw_progress(scrn: pygame.Surface, progress: float):
+    """
+    Loading screen: a bar across the middle of the screen
+    :param progress: 0 to 1
+    :return: none
+    """
+    scrn.fill((0, 0, 0))
+    outline = pygame.Rect(0, 0, 600, 24)
+    outline.center = scrn.get_rect().center
+    pygame.draw.rect(scrn, (255, 255, 255), outline, 2)
+    bar = outline.inflate(-8, -8)
+    bar.width = int(bar.width * min(max(progress, 0.0), 1.0))
+    pygame.draw.rect(scrn, (255, 210, 60), bar)
+    pygame.display.flip()
+
+
+def load_scene(scrn: pygame.Surface, scene):
+    """
+    Loads a scene's assets, showing the progress bar until they are all decoded
+    :param scrn: pygame.Surface, None loads without drawing
+    :param scene: key of MANIFEST
+    :return: none
+    """
+    loader.request(scene)
+    clock = pygame.time.Clock()
+    while not loader.ready(scene):
+        loader.poll()
+        if scrn is not None:
+            inputs.dispatcher.pump()
+            draw_progress(scrn, loader.progress(scene))
+        clock.tick(60)
+    loader.poll()
+
+
+loader = AssetLoader()
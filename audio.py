@@ -0,0 +1,85 @@
+import pygame
+
+
+class SoundLimits:
+    """Playback rules for one sound, set through VoiceManager.configure."""
+
+    def __init__(self, max_voices=4, volume=1.0, max_volume=1.0, boost=0.1, reserved=0):
+        self.max_voices = max_voices  # copies of the sound allowed to play at once
+        self.volume = volume  # channel volume of a single play
+        self.max_volume = max_volume  # ceiling for merged plays
+        self.boost = boost  # extra volume per play merged into the same frame
+        self.reserved = reserved  # mixer channels kept for this sound alone
+        self.channels = []  # reserved pygame.mixer.Channel objects
+        self.voices = []  # channels the sound was last started on
+
+
+class VoiceManager:
+    """
+    Routes sound effects through per-sound voice caps. Plays requested during
+    a frame are queued; flush() starts each queued sound once, louder by how
+    many requests were merged into it, on a reserved channel if the sound has
+    them and only if fewer than max_voices copies are still playing.
+    Sounds that were never configured play once per frame at full volume.
+    """
+
+    def __init__(self):
+        self.limits = {}  # pygame.mixer.Sound -> SoundLimits
+        self.pending = {}  # pygame.mixer.Sound -> plays requested this frame
+        self.reserved_count = 0
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+
+    def configure(self, sound, max_voices=4, volume=1.0, max_volume=1.0, boost=0.1, reserved=0):
+        """
+        Sets the playback rules for a sound
+        :param sound: pygame.mixer.Sound
+        :param reserved: number of mixer channels set aside so crowded effects can't take them
+        :return: none
+        """
+        limits = SoundLimits(max_voices, volume, max_volume, boost, reserved)
+        if reserved:
+            first = self.reserved_count
+            self.reserved_count += reserved
+            if pygame.mixer.get_num_channels() < self.reserved_count + 1:
+                pygame.mixer.set_num_channels(self.reserved_count + 8)
+            pygame.mixer.set_reserved(self.reserved_count)
+            limits.channels = [pygame.mixer.Channel(i) for i in range(first, self.reserved_count)]
+        self.limits[sound] = limits
+
+    def play(self, sound):
+        """Queues sound for the next flush, merging with any request for it this frame."""
+        count = self.pending.get(sound, 0)
+        if count:
+            self.merged += 1
+        self.pending[sound] = count + 1
+
+    def flush(self):
+        """Starts the sounds queued this frame. Called once per frame."""
+        for sound, count in self.pending.items():
+            limits = self.limits.get(sound)
+            if limits is None:
+                sound.play()
+                self.played += 1
+                continue
+            limits.voices = [channel for channel in limits.voices if channel.get_sound() is sound]
+            if len(limits.voices) >= limits.max_voices:
+                self.dropped += count
+                continue
+            if limits.channels:
+                channel = next((channel for channel in limits.channels if not channel.get_busy()), None)
+                if channel is not None:
+                    channel.play(sound)
+            else:
+                channel = sound.play()
+            if channel is None:  # every channel busy
+                self.dropped += count
+                continue
+            channel.set_volume(min(limits.volume + limits.boost * (count - 1), limits.max_volume))
+            limits.voices.append(channel)
+            self.played += 1
+        self.pending.clear()
+
+    def stats(self) -> dict:
+        return {"played": self.played, "merged": self.merged, "dropped": self.dropped}
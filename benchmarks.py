@@ -0,0 +1,357 @@
+"""
+Benchmarks of the game's hot paths, run headless on the simulation clock.
+
+Micro cases time one subsystem in isolation on a fixed scene, macro cases play
+real waves end to end. Results are written as JSON and compared with a baseline
+file; a case whose median time per operation grew by more than its threshold
+is a regression and makes the run exit with status 1:
+
+    python benchmarks.py --save-baseline     # on a known good tree
+    python benchmarks.py                     # after a change
+    python benchmarks.py tower_update full_wave --repeat 40
+
+Timings depend on the machine, so the baseline is made locally and is not
+committed; both the results and the baseline file are git-ignored.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import pygame
+import enemy_store
+import game_tools
+import paths
+import waves
+from collisions import collide_recruits
+from enemies import AntEnemy, HornetEnemy
+from simulation import Simulation, DEFAULT_LAYOUT
+
+RESULTS_PATH = "benchmark_results.json"
+BASELINE_PATH = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.20  # allowed slowdown of the median, as a fraction of the baseline
+BIG_HEALTH = 10 ** 9  # keeps benchmark enemies and recruits alive between samples
+SCENE_ENEMIES = 300
+
+BENCHMARKS = {}  # name -> (setup function, kind, threshold)
+
+
+def benchmark(name, kind="micro", threshold=DEFAULT_THRESHOLD):
+    """Registers a setup function returning the Case to time."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, kind, threshold)
+        return setup
+    return register
+
+
+class Case:
+    """
+    One benchmark ready to run: run() does ops operations and is timed,
+    reset() puts the scene back between samples and is not.
+    """
+
+    def __init__(self, run, ops, reset=None, repeat=None):
+        self.run = run
+        self.ops = ops
+        self.reset = reset
+        self.repeat = repeat  # samples to take, None for the suite's default
+
+
+def _quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def spread_enemies(count=SCENE_ENEMIES, health=BIG_HEALTH) -> list:
+    """Spawns count ants and hornets spaced evenly along the house path."""
+    table = paths.get_path_table(game_tools.house_path)
+    spawned = []
+    for index in range(count):
+        enemy = (AntEnemy if index % 2 == 0 else HornetEnemy)()
+        enemy.health = health
+        enemy.progress = table.total * index / count
+        game_tools.enemies.append(enemy)
+        spawned.append(enemy)
+    _place(spawned)
+    return spawned
+
+
+def _place(enemies):
+    """Moves enemies onto the path at their progress without advancing them."""
+    speeds = [enemy.speed for enemy in enemies]
+    for enemy in enemies:
+        enemy.speed = 0
+    enemy_store.step_all()
+    for enemy, speed in zip(enemies, speeds):
+        enemy.speed = speed
+
+
+def _restore(enemies, progress):
+    for enemy, start in zip(enemies, progress):
+        enemy.progress = start
+        enemy.health = BIG_HEALTH
+        enemy.is_alive = True
+    _place(enemies)
+
+
+def _towers_along_path(sim, tower, count) -> list:
+    """Places count towers of a type next to evenly spaced points of the house path."""
+    table = paths.get_path_table(game_tools.house_path)
+    placed = []
+    for index in range(count):
+        (x, y), _ = table.locate(table.total * (index + 0.5) / count)
+        placed.append(sim.place_tower(tower, (int(x), int(y) + 30), pay=False))
+    return placed
+
+
+@benchmark("enemy_move")
+def bench_enemy_move():
+    Simulation(health=BIG_HEALTH)
+    enemies = spread_enemies()
+    progress = [enemy.progress for enemy in enemies]
+
+    def run():
+        for enemy in enemies:
+            enemy.move()
+    return Case(run, len(enemies), reset=lambda: _restore(enemies, progress))
+
+
+@benchmark("enemy_step_all")
+def bench_enemy_step_all():
+    Simulation(health=BIG_HEALTH)
+    enemies = spread_enemies()
+    progress = [enemy.progress for enemy in enemies]
+    return Case(enemy_store.step_all, len(enemies), reset=lambda: _restore(enemies, progress))
+
+
+@benchmark("tower_update")
+def bench_tower_update():
+    sim = Simulation(health=BIG_HEALTH)
+    spread_enemies()
+    towers = _towers_along_path(sim, "mrcheese", 20)
+
+    def run():
+        game_tools.enemy_grid.rebuild(game_tools.enemies)
+        for tower in towers:
+            tower.update(game_tools.enemies)
+    return Case(run, len(towers))
+
+
+@benchmark("ozbourne_shoot")
+def bench_ozbourne_shoot():
+    sim = Simulation(health=BIG_HEALTH)
+    enemies = spread_enemies()
+    progress = [enemy.progress for enemy in enemies]
+    towers = _towers_along_path(sim, "ozbourne", 20)
+    game_tools.enemy_grid.rebuild(game_tools.enemies)
+
+    def run():
+        for tower in towers:
+            tower.shoot(game_tools.enemies)
+
+    def reset():
+        _restore(enemies, progress)
+        game_tools.sfx.flush()
+    return Case(run, len(towers), reset=reset)
+
+
+def _recruit_scene(count=100):
+    Simulation(health=BIG_HEALTH)
+    enemies = spread_enemies()
+    progress = [enemy.progress for enemy in enemies]
+    table = paths.get_path_table(game_tools.recruit_path)
+    recruits = [game_tools.RecruitEntity(table.locate(table.total * index / count)[0], BIG_HEALTH, 1,
+                                         game_tools.recruit_path, 1, "assets/rat_recruit.png")
+                for index in range(count)]
+
+    def reset():
+        _restore(enemies, progress)
+        for recruit in recruits:
+            recruit.health = BIG_HEALTH
+            recruit.is_alive = True
+        game_tools.sfx.flush()
+    return recruits, reset
+
+
+@benchmark("recruit_check_collision")
+def bench_recruit_check_collision():
+    recruits, reset = _recruit_scene()
+
+    def run():
+        for recruit in recruits:
+            recruit.check_collision(game_tools.enemies)
+    return Case(run, len(recruits), reset=reset)
+
+
+@benchmark("collide_recruits")
+def bench_collide_recruits():
+    recruits, reset = _recruit_scene()
+    table = paths.get_path_table(game_tools.house_path)
+    return Case(lambda: collide_recruits(recruits, game_tools.enemies, table), len(recruits), reset=reset)
+
+
+@benchmark("check_hitbox")
+def bench_check_hitbox():
+    Simulation()
+    game_tools.get_placement_map()
+    rng = random.Random(0)
+    points = [(rng.randrange(game_tools.SCREEN_SIZE[0]), rng.randrange(game_tools.SCREEN_SIZE[1]))
+              for _ in range(10000)]
+
+    def run():
+        for point in points:
+            game_tools.check_hitbox(point)
+    return Case(run, len(points))
+
+
+@benchmark("send_wave_spawn")
+def bench_send_wave_spawn():
+    """Sends the 100 boss links of wave 17, one spawn per call."""
+    sim = Simulation(health=BIG_HEALTH)
+    wave = waves.WAVES[17]
+
+    def run():
+        with _quiet():
+            for _ in range(wave.size):
+                sim.clock.advance(wave.interval)
+                waves.send_wave(None, 17)
+
+    def reset():
+        with _quiet():
+            waves.start_new_wave(17)
+    return Case(run, wave.size, reset=reset)
+
+
+@benchmark("full_wave", kind="macro")
+def bench_full_wave():
+    """Plays wave 10 against the default layout, timed per tick."""
+    state = {}
+
+    def reset():
+        sim = Simulation(round_number=10, money=25000, health=100)
+        for tower, position in DEFAULT_LAYOUT:
+            sim.place_tower(tower, position)
+        state["sim"] = sim
+
+    def run():
+        sim = state["sim"]
+        sim.run_wave()
+        case.ops = sim.ticks
+    case = Case(run, 1, reset=reset, repeat=3)
+    return case
+
+
+def time_case(name, repeat) -> dict:
+    """
+    Builds a benchmark's scene and times it
+    :param repeat: samples to take when the case doesn't set its own count
+    :return: dict with the median and best time per operation in microseconds
+    """
+    setup, kind, threshold = BENCHMARKS[name]
+    case = setup()
+    samples = []
+    for index in range(1 + (case.repeat or repeat)):  # the first sample warms caches and is dropped
+        if case.reset is not None:
+            case.reset()
+        start = time.perf_counter()
+        case.run()
+        elapsed = time.perf_counter() - start
+        if index:
+            samples.append(elapsed * 1e6 / case.ops)
+    return {"kind": kind,
+            "ops": case.ops,
+            "samples": len(samples),
+            "median_us": statistics.median(samples),
+            "min_us": min(samples),
+            "threshold": threshold}
+
+
+def run_suite(names=None, repeat=20) -> dict:
+    """
+    Runs benchmarks headless
+    :param names: benchmark names, None for all
+    :return: dict with the environment and a result per benchmark
+    """
+    game_tools.init(display=False, audio=False)
+    results = {}
+    try:
+        for name in names or BENCHMARKS:
+            results[name] = time_case(name, repeat)
+    finally:
+        game_tools.set_clock(None)
+    return {"created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.platform(),
+            "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold_scale=1.0) -> list:
+    """
+    Compares two result sets case by case on the median
+    :param threshold_scale: multiplies every case's threshold
+    :return: list of (name, current median, baseline median, ratio, regressed)
+    """
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median_us"] / before["median_us"]
+        rows.append((name, result["median_us"], before["median_us"], ratio,
+                     ratio > 1 + result["threshold"] * threshold_scale))
+    return rows
+
+
+def load_results(path):
+    """A results file, or None if there is none."""
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def save_results(path, results):
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks of the game's hot paths.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run, all by default: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=20, help="samples per micro benchmark")
+    parser.add_argument("--out", default=RESULTS_PATH, help="where to write the results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results as the baseline")
+    parser.add_argument("--threshold-scale", type=float, default=1.0, help="multiplies every regression threshold")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = run_suite(args.names, args.repeat)
+    save_results(args.out, results)
+    for name, result in results["results"].items():
+        print(f"{name:24} {result['median_us']:12.2f} us/op  (best {result['min_us']:.2f}, {result['ops']} ops)")
+
+    baseline = load_results(args.baseline)
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+    elif baseline is None:
+        print(f"No baseline at {args.baseline}, run with --save-baseline to make one")
+    else:
+        rows = compare(results, baseline, args.threshold_scale)
+        print(f"\nAgainst {args.baseline} ({baseline['created']}):")
+        for name, now, before, ratio, regressed in rows:
+            print(f"{name:24} {before:12.2f} -> {now:12.2f} us/op  {ratio:6.2f}x{'  REGRESSION' if regressed else ''}")
+        if any(regressed for *_, regressed in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+def _span(key, reach):
+    return key - reach, key + reach
+
+
+def sweep_overlaps(spans_a, spans_b) -> list:
+    """
+    Sweep over two lists of 1-D intervals sorted by start
+    :param spans_a: list of (start, end, index) sorted by start
+    :param spans_b: list of (start, end, index) sorted by start
+    :return: list of (index a, index b) for every pair of overlapping intervals
+    """
+    pairs = []
+    active_a = []
+    active_b = []
+    i = j = 0
+    while i < len(spans_a) or j < len(spans_b):
+        if j == len(spans_b) or (i < len(spans_a) and spans_a[i][0] <= spans_b[j][0]):
+            start, end, index = spans_a[i]
+            i += 1
+            active_b = [span for span in active_b if span[1] >= start]
+            pairs.extend((index, other) for _, _, other in active_b)
+            active_a.append((start, end, index))
+        else:
+            start, end, index = spans_b[j]
+            j += 1
+            active_a = [span for span in active_a if span[1] >= start]
+            pairs.extend((other, index) for _, _, other in active_a)
+            active_b.append((start, end, index))
+    return pairs
+
+
+def collide_recruits(recruits, enemies, enemy_table):
+    """
+    Recruit-vs-enemy collisions. Recruits walk the enemy path backwards, so
+    both populations are placed on the enemy path by progress and only pairs
+    whose stretches of path overlap reach the colliderect narrow phase.
+    Each recruit then hits the first overlapping live enemy in spawn order,
+    like RecruitEntity.check_collision on the enemy list. Sprites that only touch
+    across a fold of the path, far apart in progress, are not tested.
+    :param recruits: list of RecruitEntity, resolved in list order
+    :param enemies: the game's enemy list
+    :param enemy_table: PathTable of the path the enemies walk
+    :return: none
+    """
+    if not recruits or not enemies:
+        return
+    recruit_spans = []
+    for index, recruit in enumerate(recruits):
+        key, _ = enemy_table.project(recruit.rect.center)
+        recruit_spans.append(_span(key, max(recruit.rect.size)) + (index,))
+    enemy_spans = []
+    for index, enemy in enumerate(enemies):
+        reach = getattr(enemy, "reach", None) or max(enemy.rect.size)
+        enemy_spans.append(_span(enemy.progress, reach) + (index,))
+    recruit_spans.sort()
+    enemy_spans.sort()
+
+    candidates = [[] for _ in recruits]
+    for recruit_index, enemy_index in sweep_overlaps(recruit_spans, enemy_spans):
+        candidates[recruit_index].append(enemy_index)
+    for recruit, found in zip(recruits, candidates):
+        if found:
+            recruit.check_collision(sorted((enemies[index] for index in found), key=lambda enemy: enemy.spawn_order))
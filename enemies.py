@@ -1,70 +1,146 @@
 import pygame
 import math
+import numpy as np
 import game_tools
+import enemy_store
+import paths
+from enemy_store import StoreColumn
 
 
-class Enemy:
-    def __init__(self, position, health, money, speed, image_path, path=game_tools.house_path):
-        self.position = position  # (x, y) tuple
+SPAWN_POINT = (238, 500)
+
+
+class EnemyArchetype:
+    """
+    Flyweight holding everything enemies of one type share: sprite, death
+    splatter, splat sound, base stats and the sprite's size. Assets are
+    loaded once, the first time the type spawns; instances only keep their
+    own mutable state and read the rest from here.
+    """
+
+    def __init__(self, image_path, health, money, speed,
+                 death_image_path="assets/splatter.png", death_sound_path="assets/splat_sfx.mp3"):
+        self.image_path = image_path
         self.health = health
         self.money = money
         self.speed = speed
+        self.death_image_path = death_image_path
+        self.death_sound_path = death_sound_path
+        self.loaded = False
+
+    def load(self):
+        if not self.loaded:
+            self.image = game_tools.load_image(self.image_path)
+            self.img_death = game_tools.load_image(self.death_image_path)
+            self.sfx_splat = game_tools.load_sound(self.death_sound_path)
+            self.size = self.image.get_size()
+            self.rect = self.image.get_rect()  # copied by each enemy, resized on turns and moved with it
+            self.loaded = True
+        return self
+
+
+class Enemy:
+    """
+    Thin handle onto a slot of the EnemyStore for its path. Position, speed,
+    health, bounty and path progress live in the store's arrays so all enemies
+    move in one batched step (see waves.send_wave); the handle keeps images,
+    sounds and the same attributes towers and projectiles always used.
+    """
+    health = StoreColumn("health", whole_numbers=True)
+    money = StoreColumn("bounty")
+    speed = StoreColumn("speed")
+    progress = StoreColumn("progress")  # Distance travelled along the path
+    angle = StoreColumn("angle")
+    is_alive = StoreColumn("alive")
+
+    archetype = None  # EnemyArchetype shared by every enemy of the subclass
+
+    def __init__(self, position=SPAWN_POINT, health=None, money=None, speed=None, image_path=None,
+                 path=game_tools.house_path):
+        """
+        Stats and image default to the class archetype; passing them overrides it for this enemy
+        """
+        archetype = self.archetype.load() if self.archetype is not None else EnemyArchetype(
+            image_path, health, money, speed).load()
         self.path = path  # List of (x, y) points the enemy follows
-        self.original_image = game_tools.load_image(image_path)
-        self.image = self.original_image
-        self.rect = self.image.get_rect(center=position)
-        self.img_death = pygame.image.load("assets/splatter.png")
-        self.size = self.rect.size  # Width and height of the enemy
-        self.current_target = 0  # Current target index in the path
-        self.is_alive = True
-        self.sfx_splat = pygame.mixer.Sound("assets/splat_sfx.mp3")
+        self.store = enemy_store.get_store(path)
+        self.slot = self.store.add(self, position,
+                                   archetype.health if health is None else health,
+                                   archetype.money if money is None else money,
+                                   archetype.speed if speed is None else speed)
+        self.original_image = archetype.image if image_path is None else game_tools.load_image(image_path)
+        self.shared = archetype
+        self._rect = archetype.rect.copy()
+        self._image = None
+        self._image_key = None  # (sprite, angle) self._image was rotated for
+
+    @property
+    def img_death(self):
+        return self.shared.img_death
+
+    @property
+    def sfx_splat(self):
+        return self.shared.sfx_splat
+
+    @property
+    def size(self):
+        """Width and height of the enemy"""
+        return self.shared.size
+
+    @property
+    def position(self):
+        if self.slot is None:
+            return self._position
+        return self.store.positions[self.slot]
+
+    @position.setter
+    def position(self, position):
+        if self.slot is None:
+            self._position = position
+        else:
+            self.store.set_position(self.slot, position)
+
+    @property
+    def image(self):
+        """The sprite rotated to face the movement direction, looked up again only when it turns."""
+        key = (self.original_image, self.angle)
+        if key != self._image_key:
+            self._image = game_tools.get_rotated(self.original_image, key[1] - 90)
+            self._image_key = key
+            self._rect.size = self._image.get_size()
+        return self._image
+
+    @property
+    def rect(self):
+        """The enemy's own Rect, moved to its current position rather than rebuilt."""
+        self.image  # resizes the rect if the enemy turned
+        self._rect.center = self.position
+        return self._rect
 
     def move(self):
-        # Move towards the next point in the path
-        if self.current_target < len(self.path):
-            target_x, target_y = self.path[self.current_target]
-            dx = target_x - self.position[0]
-            dy = target_y - self.position[1]
-            distance = (dx ** 2 + dy ** 2) ** 0.5
-
-            if distance == 0:  # Avoid division by zero
-                return
-
-            # Calculate normalized direction vector
-            direction_x = dx / distance
-            direction_y = dy / distance
-
-            # Move enemy by speed in the direction of the target
-            self.position = (
-                self.position[0] + direction_x * self.speed,
-                self.position[1] + direction_y * self.speed
-            )
-            self.rect.center = self.position
-
-            # Rotate the enemy to face the target
-            self.update_orientation(direction_x, direction_y)
-
-            # Check if the enemy reached the target
-            if distance <= self.speed:
-                self.current_target += 1
-
-        # If the enemy has reached the end of the path
-        if self.current_target >= len(self.path):
-            self.is_alive = False  # Mark as no longer active (escaped)
-            game_tools.user_health -= self.health
-
-    def update_orientation(self, direction_x, direction_y):
-        """Rotate the image to face the movement direction."""
-        # Calculate angle in radians and convert to degrees
-        angle = math.degrees(math.atan2(-direction_y, direction_x))  # Flip y-axis for Pygame
-        self.image = pygame.transform.rotate(self.original_image, angle - 90)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        """Moves just this enemy one frame; the game loop moves all of them at once instead."""
+        if self.slot is None:
+            return
+        escaped = self.store.step_one(self.slot)
+        if escaped is not None:
+            game_tools.user_health -= escaped.health
+
+    def despawn(self):
+        """Gives the store slot back; the handle keeps its final state so stale references stay safe."""
+        if self.slot is None:
+            return
+        final_state = {"_position": self.position, "_health": self.health, "_money": self.money,
+                       "_speed": self.speed, "_progress": self.progress,
+                       "_angle": self.angle, "_is_alive": False}
+        self.store.release(self.slot)
+        self.slot = None
+        self.__dict__.update(final_state)
 
     def take_damage(self, *args):
         self.health -= args[0]
         if self.health <= 0:
             self.is_alive = False
-            self.sfx_splat.play()
+            game_tools.sfx.play(self.sfx_splat)
             game_tools.money += self.money
 
     def render(self, screen):
@@ -83,13 +159,11 @@ class Enemy:
 
 
 class AntEnemy(Enemy):
-    def __init__(self, position=(238, 500), health=1, money=5, speed=1, image_path="assets/ant_base.png"):
-        super().__init__(position, health, money, speed, image_path)
+    archetype = EnemyArchetype("assets/ant_base.png", health=1, money=5, speed=1)
 
 
 class HornetEnemy(Enemy):
-    def __init__(self, position=(238, 500), health=3, money=10, speed=2, image_path="assets/hornet_base.png"):
-        super().__init__(position, health, money, speed, image_path)
+    archetype = EnemyArchetype("assets/hornet_base.png", health=3, money=10, speed=2)
 
 
 class CentipedeEnemy:
@@ -104,8 +178,7 @@ class CentipedeEnemy:
     and becomes 3 when only the head is left.
     The images are flipped horizontally in rendering.
     """
-    sfx_splat = game_tools.load_sound("assets/splat_sfx.mp3")
-    img_death = game_tools.load_image("assets/splatter.png")
+    archetype = EnemyArchetype("assets/centipede_head.png", health=6, money=25, speed=1)
 
     class Segment:
         def __init__(self, role, health, image, position):
@@ -126,13 +199,15 @@ class CentipedeEnemy:
         :param position: Starting position (tuple)
         :param path: List of points (tuples) for the centipede head to follow.
         """
+        self.shared = self.archetype.load()
         self.path = path
-        self.current_target = 0  # Index in the path for head movement
+        self.path_table = paths.get_path_table(path)
+        self.progress, _ = self.path_table.project(position)  # Head's distance travelled along the path
         self.base_speed = 1      # Initial speed
         self.speed = self.base_speed
 
         # Load images
-        head_img = game_tools.load_image("assets/centipede_head.png")
+        head_img = self.shared.image
         link_img = game_tools.load_image("assets/centipede_link.png")
         tail_img = game_tools.load_image("assets/centipede_tail.png")
 
@@ -158,6 +233,14 @@ class CentipedeEnemy:
         # Tail segment with health 3.
         self.segments.append(self.Segment("tail", 3, tail_img, position))
 
+    @property
+    def img_death(self):
+        return self.shared.img_death
+
+    @property
+    def sfx_splat(self):
+        return self.shared.sfx_splat
+
     def update(self):
         """
         Update the centipede:
@@ -178,22 +261,11 @@ class CentipedeEnemy:
 
         # === Move the head along the path ===
         head = self.segments[0]
-        if self.current_target < len(self.path):
-            target_point = self.path[self.current_target]
-            dx = target_point[0] - head.position[0]
-            dy = target_point[1] - head.position[1]
-            distance = math.hypot(dx, dy)
-            if distance:
-                dir_x = dx / distance
-                dir_y = dy / distance
-                move_dist = self.speed
-                new_x = head.position[0] + dir_x * move_dist
-                new_y = head.position[1] + dir_y * move_dist
-                head.position = (new_x, new_y)
-                head.angle = math.degrees(math.atan2(dir_x, -dir_y))
-                head.update_rect()
-                if distance <= move_dist:
-                    self.current_target += 1
+        if self.progress < self.path_table.total:
+            self.progress += self.speed
+            head.position, heading = self.path_table.locate(self.progress)
+            head.angle = (270 - heading) % 360 - 180  # segment angles count from "facing up"
+            head.update_rect()
         else:
             # Centipede reaches the end of the path
             game_tools.user_health -= head.health  # Subtract health when the enemy escapes
@@ -237,8 +309,8 @@ class CentipedeEnemy:
                 if seg.health <= 0:
                     seg.alive = False
                     game_tools.money += 15
-                    self.sfx_splat.play()
-                    seg.death_time = pygame.time.get_ticks()  # Mark the time of death
+                    game_tools.sfx.play(self.sfx_splat)
+                    seg.death_time = game_tools.get_ticks()  # Mark the time of death
                 return  # Exit after applying damage.
 
         # If all non-head segments are destroyed, apply damage to the head.
@@ -247,28 +319,26 @@ class CentipedeEnemy:
         if head.health <= 0:
             head.alive = False
             game_tools.money += 25
-            self.sfx_splat.play()
-            head.death_time = pygame.time.get_ticks()
+            game_tools.sfx.play(self.sfx_splat)
+            head.death_time = game_tools.get_ticks()
 
     def render(self, screen: pygame.Surface):
         """
         Render each alive segment with its current rotation.
         Show the splatter effect for a brief time after death.
         """
-        current_time = pygame.time.get_ticks()
+        current_time = game_tools.get_ticks()
         splatter_duration = 100  # Time in milliseconds to show the splatter (0.5 seconds)
 
         for seg in self.segments:
             if seg.alive:
                 # Render living segments
-                rotated_image = pygame.transform.rotate(seg.image, seg.angle)
-                rotated_image = pygame.transform.flip(rotated_image, True, False)  # Flip horizontally
+                rotated_image = game_tools.get_rotated(seg.image, seg.angle, flip=True)  # Flip horizontally
                 rect = rotated_image.get_rect(center=seg.position)
                 screen.blit(rotated_image, rect.topleft)
             elif seg.death_time and current_time - seg.death_time <= splatter_duration:
                 # Render splatter effect for a limited time
-                rotated_splatter = pygame.transform.rotate(self.img_death, seg.angle)
-                rotated_splatter = pygame.transform.flip(rotated_splatter, True, False)
+                rotated_splatter = game_tools.get_rotated(self.img_death, seg.angle, flip=True)
                 rect = rotated_splatter.get_rect(center=seg.position)
                 screen.blit(rotated_splatter, rect.topleft)
 
@@ -283,6 +353,19 @@ class CentipedeEnemy:
                 return seg.position
         return self.segments[0].position
 
+    @property
+    def rect(self) -> pygame.Rect:
+        """Bounding box of the segments still alive."""
+        rects = [seg.rect for seg in self.segments if seg.alive]
+        if not rects:
+            return pygame.Rect(self.position, (0, 0))
+        return rects[0].unionall(rects[1:])
+
+    @property
+    def reach(self) -> float:
+        """How far along the path the body can extend from the head."""
+        return sum(self.gap_distances) + max(self.segments[0].rect.size) if self.segments else 0
+
     @property
     def is_alive(self):
         """
@@ -292,27 +375,107 @@ class CentipedeEnemy:
         return bool(self.segments) and self.segments[0].alive
 
 
+class CentipedeChain:
+    """
+    The links of one CentipedeBoss as a doubly linked list, front to back.
+    The chain knows its head and tail, so a link's role is an identity check;
+    roles and head/tail sprites only change when a link is added or leaves
+    the game, and chain-wide changes are applied in one go.
+    """
+    HEAD_IMAGE = "assets/centipede_head.png"
+    TAIL_IMAGE = "assets/centipede_tail.png"
+
+    def __init__(self):
+        self.head = None
+        self.tail = None
+        self.length = 0
+
+    def append(self, link):
+        """Adds a link behind the current tail; it becomes the new tail."""
+        old_tail = self.tail
+        link.chain = self
+        link.ahead = old_tail
+        link.behind = None
+        if old_tail is None:
+            self.head = link
+        else:
+            old_tail.behind = link
+        self.tail = link
+        self.length += 1
+        self._restyle(old_tail)
+        self._restyle(link)
+
+    def unlink(self, link):
+        """Takes a link out; its neighbours take over the head or tail role."""
+        if link.ahead is None:
+            self.head = link.behind
+        else:
+            link.ahead.behind = link.behind
+        if link.behind is None:
+            self.tail = link.ahead
+        else:
+            link.behind.ahead = link.ahead
+        self._restyle(link.ahead)
+        self._restyle(link.behind)
+        link.chain = link.ahead = link.behind = None
+        self.length -= 1
+
+    def is_end(self, link) -> bool:
+        return link is self.head or link is self.tail
+
+    def links(self):
+        link = self.head
+        while link is not None:
+            yield link
+            link = link.behind
+
+    def set_speed(self, speed):
+        """Sets the speed of every link with one store write per path."""
+        slots = {}
+        for link in self.links():
+            if link.slot is not None:
+                slots.setdefault(link.store, []).append(link.slot)
+        for store, store_slots in slots.items():
+            store.speed[np.array(store_slots)] = speed
+
+    def _restyle(self, link):
+        if link is None:
+            return
+        if link is self.head:
+            link.original_image = game_tools.load_image(self.HEAD_IMAGE)
+        elif link is self.tail:
+            link.original_image = game_tools.load_image(self.TAIL_IMAGE)
+        else:
+            link.original_image = link.own_image
+
+
 class CentipedeBoss(Enemy):
-    def __init__(self, index, position=(238, 500), health=15, money=15,
-                 speed=0.75, image_path="assets/centipede_head.png"):
+    archetype = EnemyArchetype("assets/centipede_head.png", health=15, money=15, speed=0.75)
+    LINK_HEALTH = 250
+
+    def __init__(self, index, position=SPAWN_POINT, health=None, money=None, speed=None, image_path=None,
+                 chain=None):
+        """
+        :param chain: CentipedeChain the link joins at the back, a new chain when None
+        """
         super().__init__(position, health, money, speed, image_path)
         self.index = index
-        self.link_health = 250
+        self.link_health = self.LINK_HEALTH
+        self.own_image = self.original_image
+        (chain if chain is not None else CentipedeChain()).append(self)
 
-    def move(self):
-        if self.index == game_tools.enemies[0].index:
-            self.original_image = game_tools.load_image("assets/centipede_head.png")
-        elif self.index == game_tools.enemies[len(game_tools.enemies)-1].index:
-            self.original_image = game_tools.load_image("assets/centipede_tail.png")
-        super().move()
+    def despawn(self):
+        if self.chain is not None:
+            self.chain.unlink(self)
+        super().despawn()
 
     def take_damage(self, damage):
-        if (self.index == game_tools.enemies[0].index or
-                self.index == game_tools.enemies[len(game_tools.enemies)-1].index):
+        # the front and back of the remaining chain take damage on health, the links in between on link_health
+        if self.chain is not None and self.chain.is_end(self):
             self.health -= damage
         else:
             self.link_health -= damage
         if self.health <= 0 or self.link_health <= 0:
             self.is_alive = False
-            self.sfx_splat.play()
+            game_tools.sfx.play(self.sfx_splat)
             game_tools.money += self.money
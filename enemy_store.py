@@ -0,0 +1,183 @@
+import numpy as np
+from paths import get_path_table
+
+
+class EnemyStore:
+    """
+    Structure-of-arrays storage for enemies that walk a path. Position, speed,
+    health, bounty and path progress of every enemy live in NumPy columns so
+    the whole population moves in one batched step per frame. Enemy objects
+    only hold their slot index and read and write through it. Progress is the
+    distance travelled along the path; position and heading are looked up from
+    the path's PathTable.
+    """
+
+    # column name -> (dtype, value of an empty slot)
+    COLUMNS = {"x": (float, 0.0),
+               "y": (float, 0.0),
+               "speed": (float, 0.0),
+               "health": (float, 0.0),
+               "bounty": (np.int64, 0),
+               "progress": (float, 0.0),  # distance travelled along the path
+               "angle": (float, 90.0),  # heading in degrees, 90 is the unrotated sprite
+               "alive": (bool, False),
+               "occupied": (bool, False)}
+
+    def __init__(self, path, capacity=128):
+        self.table = get_path_table(path)
+        self.capacity = 0
+        self.size = 0  # slots below this index have been handed out at least once
+        self.handles = []
+        self.positions = []  # (x, y) tuples mirrored from the x/y columns after every step, for cheap scalar reads
+        self._free = []
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        for name, (dtype, empty) in self.COLUMNS.items():
+            column = np.full(capacity, empty, dtype=dtype)
+            if self.capacity:
+                column[:self.capacity] = getattr(self, name)
+            setattr(self, name, column)
+        self.handles.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def add(self, handle, position, health, money, speed) -> int:
+        """
+        Claims a slot for a new enemy
+        :param handle: the Enemy object that owns the slot
+        :return: int, slot index
+        """
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow(self.capacity * 2)
+            slot = self.size
+            self.size += 1
+            self.positions.append(None)
+        self.set_position(slot, position)
+        self.speed[slot] = speed
+        self.health[slot] = health
+        self.bounty[slot] = money
+        self.alive[slot] = True
+        self.occupied[slot] = True
+        self.handles[slot] = handle
+        return slot
+
+    def set_position(self, slot, position):
+        """Puts the enemy on the point of the path closest to position."""
+        self.progress[slot], _ = self.table.project(position)
+        (self.x[slot], self.y[slot]), self.angle[slot] = self.table.locate(self.progress[slot])
+        self.positions[slot] = (self.x[slot].item(), self.y[slot].item())
+
+    def release(self, slot):
+        self.occupied[slot] = False
+        self.alive[slot] = False
+        self.handles[slot] = None
+        self._free.append(slot)
+
+    def clear(self):
+        for handle in self.handles[:self.size]:
+            if handle is not None:
+                handle.despawn()
+
+    def step(self, slots=None) -> list:
+        """
+        Advances enemies one frame along the path by their speed
+        :param slots: slot indices to move, every occupied slot when None
+        :return: list of handles that walked off the end of the path this step
+        """
+        every_slot = slots is None
+        if every_slot:
+            slots = np.flatnonzero(self.occupied[:self.size])
+        slots = slots[self.progress[slots] < self.table.total]
+        if slots.size == 0:
+            return []
+
+        self.progress[slots] += self.speed[slots]
+        self.x[slots], self.y[slots], self.angle[slots] = self.table.locate_many(self.progress[slots])
+        if every_slot:
+            self.positions[:self.size] = zip(self.x[:self.size].tolist(), self.y[:self.size].tolist())
+        else:
+            for slot, x, y in zip(slots.tolist(), self.x[slots].tolist(), self.y[slots].tolist()):
+                self.positions[slot] = (x, y)
+
+        escaped = slots[self.progress[slots] >= self.table.total]
+        self.alive[escaped] = False
+        return [self.handles[slot] for slot in escaped]
+
+    def step_one(self, slot):
+        """
+        step() for a single slot, with scalar math instead of one-element arrays
+        :return: the handle if it walked off the end of the path this step, else None
+        """
+        progress = self.progress[slot].item()
+        if progress >= self.table.total:
+            return None
+        progress += self.speed[slot].item()
+        (x, y), angle = self.table.locate(progress)
+        self.progress[slot] = progress
+        self.x[slot], self.y[slot], self.angle[slot] = x, y, angle
+        self.positions[slot] = (x, y)
+        if progress >= self.table.total:
+            self.alive[slot] = False
+            return self.handles[slot]
+        return None
+
+
+class StoreColumn:
+    """
+    Enemy attribute backed by a column of its EnemyStore. Once the enemy is
+    despawned the last value is kept on the object itself.
+    """
+
+    def __init__(self, column, whole_numbers=False):
+        self.column = column
+        self.whole_numbers = whole_numbers  # hand back ints while the value has no fraction
+
+    def __set_name__(self, owner, name):
+        self.name = "_" + name
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        if enemy.slot is None:
+            return enemy.__dict__[self.name]
+        value = getattr(enemy.store, self.column)[enemy.slot].item()
+        if self.whole_numbers and value.is_integer():
+            return int(value)
+        return value
+
+    def __set__(self, enemy, value):
+        if enemy.slot is None:
+            enemy.__dict__[self.name] = value
+        else:
+            getattr(enemy.store, self.column)[enemy.slot] = value
+
+
+_stores = {}
+
+
+def get_store(path) -> EnemyStore:
+    """The shared store for enemies walking path, created on first use."""
+    key = tuple(path)
+    if key not in _stores:
+        _stores[key] = EnemyStore(path)
+    return _stores[key]
+
+
+def step_all() -> list:
+    """
+    Moves every stored enemy one frame
+    :return: list of enemies that escaped this step
+    """
+    escaped = []
+    for store in _stores.values():
+        escaped.extend(store.step())
+    return escaped
+
+
+def clear():
+    """Despawns every stored enemy."""
+    for store in _stores.values():
+        store.clear()
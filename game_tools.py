@@ -1,30 +1,142 @@
 import pygame
 from pygame import mixer
-from towers import MrCheese, RatTent, Ozbourne
+import towers as tower_types  # module import so towers.py can be imported first
+from spatial_index import SpatialHash
+from targeting import TargetClaims
+import enemy_store
+import audio
+import inputs
+from animation import FrameAnimation, FadeIn, Timeline
+from placement import PlacementMap
+from registry import EntityRegistry
+import hud
+import profiling
+import paths
 import math
-import time
 
-pygame.init()
-pygame.display.set_mode((1280, 720))
+SCREEN_SIZE = (1280, 720)
+_display_enabled = False
+_audio_enabled = False
 
 # Asset and resource caching for performance
 _asset_cache = {}
 _sound_cache = {}
 _font_cache = {}
+_rotation_cache = {}
+ROTATION_STEPS = 360  # angle buckets per full turn for cached rotated sprites
+# sprites that turn as they move, rotated up front so the first wave doesn't pay for it
+ROTATING_SPRITES = [("assets/ant_base.png", False),
+                    ("assets/hornet_base.png", False),
+                    ("assets/centipede_head.png", False),
+                    ("assets/centipede_link.png", False),
+                    ("assets/centipede_tail.png", False),
+                    ("assets/centipede_head.png", True),
+                    ("assets/centipede_link.png", True),
+                    ("assets/centipede_tail.png", True),
+                    ("assets/splatter.png", True),
+                    ("assets/rat_recruit.png", False),
+                    ("assets/rat_recruit_faster.png", False),
+                    ("assets/rat_recruit_stronger.png", False),
+                    ("assets/rat_recruit_stronger+faster.png", False)]
+
+# voice caps for effects that can fire many times per frame, see audio.VoiceManager
+sfx = audio.VoiceManager()
+SOUND_LIMITS = {"assets/splat_sfx.mp3": {"max_voices": 3, "volume": 0.6, "boost": 0.08},
+                "assets/purchase_sound.mp3": {"max_voices": 1},
+                "assets/riff1.mp3": {"max_voices": 2, "reserved": 2},
+                "assets/riff_longer.mp3": {"max_voices": 2, "reserved": 2}}  # upgraded Ozbourne riff
+
+
+class NullSound:
+    """Stands in for pygame.mixer.Sound when the game runs without audio."""
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def set_volume(self, value):
+        pass
+
+    def get_volume(self) -> float:
+        return 0.0
+
+    def get_length(self) -> float:
+        return 0.0
+
+
+def init(display=True, audio=True):
+    """
+    Starts the pygame subsystems the game needs. Importing the game modules
+    opens nothing; call this once before loading assets.
+    :param display: open the game window. False is the null display: images are
+        decoded at their real size but kept unconverted and nothing is shown.
+    :param audio: open the audio device. False is the null audio backend: every
+        sound is a silent NullSound.
+    :return: the display surface, or None with the null display
+    """
+    global _display_enabled, _audio_enabled
+    pygame.font.init()
+    screen = None
+    if display:
+        pygame.display.init()
+        screen = pygame.display.set_mode(SCREEN_SIZE)
+        _display_enabled = True
+    if audio:
+        pygame.mixer.init()
+        _audio_enabled = True
+    return screen
 
 
 def load_image(path):
     if path not in _asset_cache:
-        _asset_cache[path] = pygame.image.load(path).convert_alpha()
+        image = pygame.image.load(path)
+        _asset_cache[path] = image.convert_alpha() if _display_enabled else image
     return _asset_cache[path]
 
 
 def load_sound(path):
     if path not in _sound_cache:
+        if not _audio_enabled:
+            _sound_cache[path] = NullSound()
+            return _sound_cache[path]
         _sound_cache[path] = pygame.mixer.Sound(path)
+        if path in SOUND_LIMITS:
+            sfx.configure(_sound_cache[path], **SOUND_LIMITS[path])
     return _sound_cache[path]
 
 
+def is_cached(path) -> bool:
+    return path in _asset_cache or path in _sound_cache
+
+
+def decode_asset(path):
+    """
+    Reads and decodes an image or sound without touching the display, so it
+    is safe to call from a worker thread. Pass the result to cache_asset.
+    :return: pygame.Surface, pygame.mixer.Sound or NullSound
+    """
+    if path.endswith((".mp3", ".wav", ".ogg")):
+        return pygame.mixer.Sound(path) if _audio_enabled else NullSound()
+    return pygame.image.load(path)
+
+
+def cache_asset(path, asset):
+    """
+    Stores an image or sound decoded elsewhere (see assets.AssetLoader) so
+    load_image and load_sound return it. Call from the main thread.
+    :param asset: result of decode_asset
+    :return: none
+    """
+    if isinstance(asset, pygame.Surface):
+        _asset_cache[path] = asset.convert_alpha() if _display_enabled else asset
+    else:
+        _sound_cache[path] = asset
+        if _audio_enabled and path in SOUND_LIMITS:
+            sfx.configure(asset, **SOUND_LIMITS[path])
+
+
 def get_font(name, size):
     key = (name, size)
     if key not in _font_cache:
@@ -32,8 +144,67 @@ def get_font(name, size):
     return _font_cache[key]
 
 
+def get_rotated(image, angle, flip=False):
+    """
+    Rotated copy of an image, snapped to one of ROTATION_STEPS angles and cached
+    so each orientation is only ever rotated once
+    :param image: source surface
+    :param angle: counterclockwise rotation in degrees
+    :param flip: also mirror the rotated image horizontally
+    :return: pygame.Surface
+    """
+    step = round(angle * ROTATION_STEPS / 360) % ROTATION_STEPS
+    key = (image, step, flip)
+    rotated = _rotation_cache.get(key)
+    if rotated is None:
+        rotated = pygame.transform.rotate(image, step * 360 / ROTATION_STEPS)
+        if flip:
+            rotated = pygame.transform.flip(rotated, True, False)
+        _rotation_cache[key] = rotated
+    return rotated
+
+
+def prewarm_rotations(sprites=ROTATING_SPRITES):
+    """
+    Fills the rotation cache for every angle of the given sprites
+    :param sprites: list of (image path, flip) pairs
+    :return: none
+    """
+    for path, flip in sprites:
+        image = load_image(path)
+        for step in range(ROTATION_STEPS):
+            get_rotated(image, step * 360 / ROTATION_STEPS, flip)
+
+
+# Gameplay clock, swapped for a fixed-step clock by the headless simulation
+_clock = pygame.time.get_ticks
+
+
+def get_ticks() -> int:
+    """
+    Current gameplay time in milliseconds. Towers, enemies and waves read their
+    timers from here instead of pygame.time.get_ticks() so time can be injected.
+    :return: int
+    """
+    return _clock()
+
+
+def set_clock(clock=None):
+    """
+    Replaces the gameplay clock
+    :param clock: callable returning the time in milliseconds, None restores the pygame clock
+    :return: none
+    """
+    global _clock
+    _clock = clock if clock is not None else pygame.time.get_ticks
+
+
 towers = []
-enemies = []
+enemies = EntityRegistry()  # live enemies, removed by swap-remove; hold entity_ids rather than references
+enemy_grid = SpatialHash(1280, 720)  # rebuilt from enemies every frame in update_towers
+target_claims = TargetClaims()  # enemy -> towers targeting it, updated as towers retarget
+placement_map = None  # PlacementMap, see get_placement_map
+timeline = Timeline()  # splash, fade and cutscene animations drawn over the game, advanced once per frame
 enemies_spawned = 0
 wave_size = 0
 spawn_interval = 0
@@ -48,10 +219,9 @@ last_time_sfx = pygame.time.get_ticks()
 money = 25000  # change for debugging
 user_health = 100
 
-# Load frames once globally
-frames = [load_image(f"assets/splash/splash{i}.png") for i in range(1, 8)]
-# mog frames
-frames_mog = [load_image(f"assets/rat_mog/mog{i}.png") for i in range(0, 31)]
+# Animation frames, decoded on first use or ahead of time by the assets loader
+SPLASH_FRAMES = [f"assets/splash/splash{i}.png" for i in range(1, 8)]
+MOG_FRAMES = [f"assets/rat_mog/mog{i}.png" for i in range(0, 31)]
 # Define custom frame durations
 frame_durations = {0: 0,
                    1: 0,
@@ -90,121 +260,80 @@ recruit_path = [(580, 524), (727, 504), (826, 515), (897, 476), (884, 344), (703
                 (221, 447), (237, 502)]
 
 
-def play_splash_animation(scrn: pygame.Surface, pos: tuple, frame_delay: int = 5):
-    for current_frame in range(len(frames)):
-        # Draw the current frame
-        scrn.blit(frames[current_frame], (pos[0] - 38, pos[1] - 38))
-        pygame.display.flip()  # Update the display
-        # Delay for frame_delay iterations of the game clock
-        for _ in range(frame_delay):
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); exit()
-        pygame.time.delay(16)  # Adjust timing to maintain responsiveness
-
-def play_mog_animation(scrn: pygame.Surface):
-    global MogFlag
+def play_splash_animation(pos: tuple, frame_delay: int = 16):
+    """
+    Starts the splash shown where a tower was placed, drawn over the game by timeline
+    :param pos: center of the splash
+    :param frame_delay: milliseconds per frame
+    :return: FrameAnimation
+    """
+    frames = [load_image(path) for path in SPLASH_FRAMES]
+    splash = FrameAnimation(frames, (pos[0] - 38, pos[1] - 38), default_duration=frame_delay)
+    return timeline.play(splash, get_ticks())
+
+
+def play_mog_animation():
+    """
+    Starts the mog cutscene: a fade into the first shown frame, then the frames
+    with their frame_durations. Player input is ignored until it finishes and
+    the map music resumes afterwards.
+    :return: FadeIn, the first part of the cutscene
+    """
     mixer.music.pause()
     mog_song = load_sound("assets/mog_song.mp3")
-    pos = (0, 0)
     mog_song.play()
-    fade_into_image(scrn, "assets/rat_mog/mog12.png", 1000)
-    for current_frame in range(len(frames_mog)):
-        if frame_durations.get(current_frame, 250) == 0:
-            continue
-        scrn.blit(frames_mog[current_frame], pos)
-        pygame.display.flip()  # Update the display
-        duration = frame_durations.get(current_frame, 250)
-        start_time = pygame.time.get_ticks()
-        while pygame.time.get_ticks() - start_time < duration:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); exit()
-        # Set MogFlag correctly at the last frame
-        MogFlag = (current_frame == 31)
+    frames_mog = [load_image(path) for path in MOG_FRAMES]
+    fade = fade_into_image("assets/rat_mog/mog12.png", 1000, modal=True)
+    fade.followed_by(FrameAnimation(frames_mog, (0, 0), frame_durations, default_duration=250,
+                                    modal=True, on_finish=mixer.music.unpause))
+    return fade
 
 def detect_single_click(delay=.3):
-    # Static variables for tracking mouse state and time of last click
-    if not hasattr(detect_single_click, "was_pressed"):
-        detect_single_click.was_pressed = False
-        detect_single_click.last_click_time = 0
-    # Current time
-    current_time = time.time()
-    # Check if the left mouse button is pressed
-    click = pygame.mouse.get_pressed()[0]
-    # Detect the transition from "not pressed" to "pressed" with delay
-    if click and not detect_single_click.was_pressed:
-        if current_time - detect_single_click.last_click_time >= delay:
-            detect_single_click.was_pressed = True
-            detect_single_click.last_click_time = current_time
-            return True
-    elif not click:
-        detect_single_click.was_pressed = False
-    return False
+    """
+    True for the first check in a frame after a left click, see inputs.InputDispatcher.clicked
+    :param delay: seconds a new click is ignored after the last accepted one
+    :return: bool
+    """
+    return inputs.dispatcher.clicked(delay * 1000)
+
+def get_placement_map() -> PlacementMap:
+    """The legality and tower-id rasters of the house map, built on first use."""
+    global placement_map
+    if placement_map is None:
+        placement_map = PlacementMap(load_image("assets/house_illegal_regions.png"))
+        for tower in towers:
+            placement_map.add(tower)
+    return placement_map
+
 
-def check_hitbox(image, position, placed_towers):
-    x, y = position
-    # Check if the position is within the transparent area of the main hitbox image
-    if 0 <= x < image.get_width() and 0 <= y < image.get_height():
-        pixel = image.get_at((x, y))
-        if pixel.a != 0:  # Not transparent
-            return False
-    # Check if the position is on top of any existing tower
-    for tower in placed_towers:
-        if hasattr(tower, 'rect') and hasattr(tower, 'image'):
-            tower_x, tower_y = tower.rect.topleft
-            tower_width, tower_height = tower.image.get_width(), tower.image.get_height()
-            if tower_x <= x < tower_x + tower_width and tower_y <= y < tower_y + tower_height:
-                relative_x = x - tower_x
-                relative_y = y - tower_y
-                pixel = tower.image.get_at((int(relative_x), int(relative_y)))
-                if pixel.a != 0:  # Not transparent
-                    return False
-    return True  # Valid placement
+def check_hitbox(position):
+    """
+    Whether a tower can be placed at position: not on the illegal regions of
+    the house and not on top of an existing tower
+    :param position: (x, y) relative to hitbox_position
+    :return: bool
+    """
+    return get_placement_map().is_legal(position)
 
 def within_spawn_point(cursor_position, path, radius=50):
-    def closest_point_on_segment(p, p1, p2):
-        x, y = p
-        x1, y1 = p1
-        x2, y2 = p2
-        dx, dy = x2 - x1, y2 - y1
-        if dx == dy == 0:
-            return p1
-        t = max(0, min(1, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
-        return (x1 + t * dx, y1 + t * dy)
-    closest_point = None
-    min_distance = float('inf')
-    for i in range(len(path) - 1):
-        p1, p2 = path[i], path[i + 1]
-        px, py = closest_point_on_segment(cursor_position, p1, p2)
-        distance = ((px - cursor_position[0]) ** 2 + (py - cursor_position[1]) ** 2) ** 0.5
-        if distance < min_distance:
-            min_distance = distance
-            closest_point = (px, py)
-    return min_distance <= radius
-
-def fade_into_image(scrn: pygame.Surface, image_path: str, duration: int = 200):
-    """
-    Fades into an image over a specified duration.
-    :param scrn: Pygame display surface
-    :param image_path: Path to the image file
+    """
+    Whether a point is close enough to the path for recruits to spawn from it
+    :param radius: maximum distance to the path in pixels
+    :return: bool
+    """
+    return paths.get_path_table(path).distance_field().within(cursor_position, radius)
+
+def fade_into_image(image_path: str, duration: int = 200, modal=False):
+    """
+    Fades into an image over a specified duration, drawn over the game by timeline.
+    :param image_path: Path to the image file, centered on the screen
     :param duration: Duration of the fade in milliseconds
+    :param modal: ignore player input while fading
+    :return: FadeIn
     """
-    clock = pygame.time.Clock()
     image = load_image(image_path)
-    image_rect = image.get_rect(center=scrn.get_rect().center)
-    fade_surface = pygame.Surface(scrn.get_size()).convert_alpha()
-    fade_surface.fill((0, 0, 0))
-    alpha = 255  # Start fully opaque
-    fade_steps = duration // 10  # Number of steps based on duration
-    for step in range(fade_steps + 1):
-        scrn.blit(image, image_rect)
-        fade_surface.set_alpha(alpha)
-        scrn.blit(fade_surface, (0, 0))
-        pygame.display.flip()
-        alpha -= 255 // fade_steps
-        clock.tick(60)  # Limit frame rate to 60 FPS
-    scrn.blit(image, image_rect)  # Final draw without fade
+    image_rect = image.get_rect(center=(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2))
+    return timeline.play(FadeIn(image, image_rect.topleft, duration, modal=modal), get_ticks())
 
 def check_game_menu_elements(scrn: pygame.surface) -> str:
     global RoundFlag, money, UpgradeFlag, curr_upgrade_tower
@@ -229,28 +358,27 @@ def check_game_menu_elements(scrn: pygame.surface) -> str:
         scrn.blit(img_tower_select, (1115, 101))
         scrn.blit(img_mrcheese_text, (1113, 53))
         if detect_single_click() and money >= 150:
-            purchase.play()
+            sfx.play(purchase)
             return "mrcheese"
     # RAT CAMP
     elif 1195 <= mouse[0] <= 1195 + 73 and 288 <= mouse[1] <= 288 + 88:
         scrn.blit(img_ratcamp_text, (1113, 53))
         scrn.blit(img_tower_select, (1192, 288))
         if detect_single_click() and money >= 650:
-            purchase.play()
+            sfx.play(purchase)
             return "rattent"
     # CHEESY OZBOURNE
     elif 1118 <= mouse[0] <= 1118 + 73 and 382 <= mouse[1] <= 382 + 88:
         scrn.blit(img_ozbourne_text, (1113, 53))
         scrn.blit(img_tower_select, (1118, 382))
         if detect_single_click() and money >= 500:
-            purchase.play()
+            sfx.play(purchase)
             return "ozbourne"
     # check if any tower is clicked after placement
-    for tower in towers:
-        if (tower.position[0] - 25) <= mouse[0] <= (tower.position[0] + 25) and (tower.position[1] - 25) <= mouse[1] <= (tower.position[1] + 25):
-            if detect_single_click():
-                UpgradeFlag = True
-                curr_upgrade_tower = tower
+    tower = get_placement_map().tower_at(mouse)
+    if tower is not None and detect_single_click():
+        UpgradeFlag = True
+        curr_upgrade_tower = tower
     if UpgradeFlag:
         handle_upgrade(scrn, curr_upgrade_tower)
     return "NULL"
@@ -263,11 +391,12 @@ def handle_upgrade(scrn, tower):
     img_upgrade_highlighted = load_image("assets/upgrade_window_highlighted.png")
     img_sell_button = load_image("assets/sell_button.png")
     upgrade_font = get_font("arial", 16)
+    sprite = tower.original_image
     scrn.blit(img_upgrade_window, (882, 0))
     scrn.blit(img_sell_button, (997, 298))
     text_sell = upgrade_font.render(f"SELL: ${tower.sell_amt}", True, (255, 255, 255))
     scrn.blit(text_sell, (1015, 306))
-    if isinstance(tower, MrCheese):
+    if isinstance(tower, tower_types.MrCheese):
         img_booksmart_upgrade = load_image("assets/upgrade_booksmart.png")
         img_protein_upgrade = load_image("assets/upgrade_protein.png")
         img_diploma_upgrade = load_image("assets/upgrade_diploma.png")
@@ -292,7 +421,7 @@ def handle_upgrade(scrn, tower):
         if 997 <= mouse[0] <= 997 + 105 and 298 <= mouse[1] <= 298 + 35:
             if detect_single_click():
                 money += tower.sell_amt
-                towers.remove(tower)
+                remove_tower(tower)
                 UpgradeFlag = False
                 return
         # check bounds of upgrade, return 1 or 2 for top or bottom choice
@@ -300,7 +429,7 @@ def handle_upgrade(scrn, tower):
             scrn.blit(img_upgrade_highlighted, (883, 65))
             if detect_single_click():
                 if tower.curr_top_upgrade == 0 and money >= 400:
-                    purchase.play()
+                    sfx.play(purchase)
                     money -= 400
                     tower.sell_amt += 200
                     tower.radius = 150
@@ -317,7 +446,7 @@ def handle_upgrade(scrn, tower):
                         tower.image = load_image("assets/mrcheese_steroids+booksmart.png")
                         tower.original_image = load_image("assets/mrcheese_steroids+booksmart.png")
                 elif money >= 1200 and tower.curr_top_upgrade == 1 and tower.curr_bottom_upgrade != 2:
-                    purchase.play()
+                    sfx.play(purchase)
                     money -= 1200
                     tower.sell_amt += 600
                     tower.radius = 200
@@ -334,7 +463,7 @@ def handle_upgrade(scrn, tower):
             scrn.blit(img_upgrade_highlighted, (883, 194))
             if detect_single_click():
                 if money >= 450 and tower.curr_bottom_upgrade == 0:
-                    purchase.play()
+                    sfx.play(purchase)
                     tower.damage = 3
                     money -= 450
                     tower.sell_amt += 225
@@ -350,7 +479,7 @@ def handle_upgrade(scrn, tower):
                         tower.image = load_image("assets/mrcheese_diploma+protein.png")
                         tower.original_image = load_image("assets/mrcheese_diploma+protein.png")
                 elif money >= 900 and tower.curr_bottom_upgrade == 1 and tower.curr_top_upgrade != 2:
-                    purchase.play()
+                    sfx.play(purchase)
                     tower.damage = 5
                     tower.penetration = True
                     money -= 900
@@ -365,7 +494,7 @@ def handle_upgrade(scrn, tower):
                     elif tower.curr_top_upgrade == 1:
                         tower.image = load_image("assets/mrcheese_steroids+booksmart.png")
                         tower.original_image = load_image("assets/mrcheese_steroids+booksmart.png")
-    if isinstance(tower, RatTent):
+    if isinstance(tower, tower_types.RatTent):
         img_fasterrats_upgrade = load_image("assets/upgrade_fasterrats.png")
         img_strongrats_upgrade = load_image("assets/upgrade_strongerrats.png")
         upgrade_font = get_font("arial", 16)
@@ -381,7 +510,7 @@ def handle_upgrade(scrn, tower):
             scrn.blit(img_upgrade_highlighted, (883, 65))
             if detect_single_click():
                 if tower.curr_top_upgrade == 0 and money >= 1250:
-                    purchase.play()
+                    sfx.play(purchase)
                     money -= 1250
                     tower.sell_amt += 625
                     tower.recruit_speed = 2
@@ -402,14 +531,14 @@ def handle_upgrade(scrn, tower):
         if 997 <= mouse[0] <= 997 + 105 and 298 <= mouse[1] <= 298 + 35:
             if detect_single_click():
                 money += tower.sell_amt
-                towers.remove(tower)
+                remove_tower(tower)
                 UpgradeFlag = False
                 return
         if 883 <= mouse[0] <= 883 + 218 and 194 <= mouse[1] <= 194 + 100:
             scrn.blit(img_upgrade_highlighted, (883, 194))
             if detect_single_click():
                 if money >= 1000 and tower.curr_bottom_upgrade == 0:
-                    purchase.play()
+                    sfx.play(purchase)
                     tower.recruit_health = 3
                     money -= 1000
                     tower.sell_amt += 500
@@ -426,7 +555,7 @@ def handle_upgrade(scrn, tower):
                     elif tower.curr_top_upgrade == 2:
                         tower.image = load_image("assets/mrcheese_diploma+protein.png")
                         tower.original_image = load_image("assets/mrcheese_diploma+protein.png")
-    if isinstance(tower, Ozbourne):
+    if isinstance(tower, tower_types.Ozbourne):
         img_amplifier_upgrade = load_image("assets/upgrade_amplifier.png")
         img_longerriffs_upgrade = load_image("assets/upgrade_longerriffs.png")
         upgrade_font = get_font("arial", 16)
@@ -442,7 +571,7 @@ def handle_upgrade(scrn, tower):
             scrn.blit(img_upgrade_highlighted, (883, 65))
             if detect_single_click():
                 if tower.curr_top_upgrade == 0 and money >= 350:
-                    purchase.play()
+                    sfx.play(purchase)
                     money -= 350
                     tower.sell_amt += 125
                     tower.riff_blast_radius = 150
@@ -463,14 +592,14 @@ def handle_upgrade(scrn, tower):
         if 997 <= mouse[0] <= 997 + 105 and 298 <= mouse[1] <= 298 + 35:
             if detect_single_click():
                 money += tower.sell_amt
-                towers.remove(tower)
+                remove_tower(tower)
                 UpgradeFlag = False
                 return
         if 883 <= mouse[0] <= 883 + 218 and 194 <= mouse[1] <= 194 + 100:
             scrn.blit(img_upgrade_highlighted, (883, 194))
             if detect_single_click():
                 if money >= 375 and tower.curr_bottom_upgrade == 0:
-                    purchase.play()
+                    sfx.play(purchase)
                     money -= 375
                     tower.sell_amt += 187
                     tower.riff_interval = (1165 / 2)
@@ -489,66 +618,91 @@ def handle_upgrade(scrn, tower):
                     elif tower.curr_top_upgrade == 2:
                         tower.image = load_image("assets/mrcheese_diploma+protein.png")
                         tower.original_image = load_image("assets/mrcheese_diploma+protein.png")
+    if tower.original_image is not sprite:
+        # the upgraded sprite covers different pixels
+        get_placement_map().restamp(tower)
     if detect_single_click() and not ((tower.position[0] - 25) <= mouse[0] <= (tower.position[0] + 25) and (tower.position[1] - 25) <= mouse[1] <= (tower.position[1] + 25)):
         UpgradeFlag = False
         return
-    for event in pygame.event.get():
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                UpgradeFlag = False
-                return
-        if event.type == pygame.QUIT:
-            pygame.quit()
+    if inputs.dispatcher.key_pressed(pygame.K_ESCAPE):
+        UpgradeFlag = False
+        return
 
     circle_surface = pygame.Surface((2 * tower.radius, 2 * tower.radius), pygame.SRCALPHA)
     pygame.draw.circle(circle_surface, (0, 0, 0, 128), (tower.radius, tower.radius), tower.radius)
     scrn.blit(circle_surface, (tower.position[0] - tower.radius, tower.position[1] - tower.radius))
 
+def clear_enemies():
+    """Empties the enemy list and hands every enemy store slot back."""
+    enemies.clear()
+    enemy_store.clear()
+
+
+def remove_tower(tower):
+    """Takes a sold tower off the map, drops its target claim and returns its projectiles to the pool."""
+    target_claims.release(tower, tower.target)
+    for projectile in tower.projectiles:
+        if isinstance(projectile, Projectile):
+            projectile_pool.release(projectile)
+    tower.projectiles.clear()
+    towers.remove(tower)
+    get_placement_map().remove(tower)
+
+
+def add_tower(tower):
+    """Puts a new tower on the map and marks its footprint as taken."""
+    towers.append(tower)
+    get_placement_map().add(tower)
+
+
 def update_towers(scrn: pygame.surface):
     global towers, enemies
+    enemy_grid.rebuild(enemies)
     for tower in towers:
         tower.update(enemies)
-        tower.render(scrn)
-        if not isinstance(tower, RatTent) and not isinstance(tower, Ozbourne):
+        if scrn is not None:  # headless simulation passes no surface
+            tower.render(scrn)
+        if not isinstance(tower, tower_types.RatTent) and not isinstance(tower, tower_types.Ozbourne):
             tower.shoot(enemies)
 
 
 def update_stats(scrn: pygame.surface, health: int, money: int, round_number: int, clock: pygame.time.Clock()):
-    health_font = get_font("arial", 28)
-    money_font = get_font("arial", 28)
-    round_font = get_font("arial", 28)
+    white = (255, 255, 255)
+    text1 = hud.text_cache.render("health", f"{health}", "arial", 28, white)
+    text3 = hud.text_cache.render("round", f"Round {round_number}", "arial", 28, white)
+
+    scrn.blit(text1, (55, 15))
+    hud.get_digit_atlas("arial", 28, white).blit(scrn, money, (65, 62))
+    scrn.blit(text3, (1150, 10))
+    profiling.profiler.draw_notice(scrn, (1000, 624))
 
-    text1 = health_font.render(f"{health}", True, (255, 255, 255))
-    text2 = money_font.render(f"{money}", True, (255, 255, 255))
-    text3 = round_font.render(f"Round {round_number}", True, (255, 255, 255))
+    if profiling.profiler.show_graph:
+        # frame-time breakdown instead of the debug text
+        profiling.profiler.draw_graph(scrn, (1000, 640))
+        return
 
     # DEBUGGING CURSOR POS
     mouse = pygame.mouse.get_pos()
     fps = int(clock.get_fps())  # Get current FPS from the passed clock
 
-    x_font = get_font("arial", 12)
-    y_font = get_font("arial", 12)
-    fps_font = get_font("arial", 12)
-
-    text_fps = fps_font.render(f"FPS: {fps}", True, (255, 0, 0))  # Render FPS in red
-    text_x = x_font.render(f"x-axis: {mouse[0]}", True, (0, 255, 0))
-    text_y = y_font.render(f"y-axis: {mouse[1]}", True, (0, 255, 0))
+    # labels never change, the numbers after them are drawn from cached digits
+    text_fps = hud.text_cache.render("fps", "FPS: ", "arial", 12, (255, 0, 0))  # Render FPS in red
+    text_x = hud.text_cache.render("x", "x-axis: ", "arial", 12, (0, 255, 0))
+    text_y = hud.text_cache.render("y", "y-axis: ", "arial", 12, (0, 255, 0))
+    red_digits = hud.get_digit_atlas("arial", 12, (255, 0, 0))
+    green_digits = hud.get_digit_atlas("arial", 12, (0, 255, 0))
 
     # Display the FPS counter just above the x/y position text
     scrn.blit(text_fps, (1000, 650))
+    red_digits.blit(scrn, fps, (1000 + text_fps.get_width(), 650))
     scrn.blit(text_x, (1000, 670))
+    green_digits.blit(scrn, mouse[0], (1000 + text_x.get_width(), 670))
     scrn.blit(text_y, (1000, 690))
-
-    # BACK TO REGULAR STUFF
-    scrn.blit(text1, (55, 15))
-    scrn.blit(text2, (65, 62))
-    scrn.blit(text3, (1150, 10))
+    green_digits.blit(scrn, mouse[1], (1000 + text_y.get_width(), 690))
 
 
 def handle_newtower(scrn: pygame.surface, tower: str) -> bool:
     global money
-    image_house_hitbox = 'assets/house_illegal_regions.png'
-    house_hitbox = load_image(image_house_hitbox)
     tower_click = load_sound("assets/tower_placed.mp3")
     mouse = pygame.mouse.get_pos()
     relative_pos = (mouse[0] - hitbox_position[0], mouse[1] - hitbox_position[1])
@@ -557,144 +711,122 @@ def handle_newtower(scrn: pygame.surface, tower: str) -> bool:
     elif tower == "mrcheese":
         img_base_rat = load_image("assets/base_rat.png")
         circle_surface = pygame.Surface((200, 200), pygame.SRCALPHA)
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return True
-        if check_hitbox(house_hitbox, relative_pos, towers):
+        if inputs.dispatcher.key_pressed(pygame.K_ESCAPE):
+            return True
+        if check_hitbox(relative_pos):
             pygame.draw.circle(circle_surface, (0, 0, 0, 128), (100, 100), 100)
             scrn.blit(img_base_rat, (mouse[0] - 25, mouse[1] - 25))
             scrn.blit(circle_surface, (mouse[0] - 100, mouse[1] - 100))
-        elif not check_hitbox(house_hitbox, relative_pos, towers):
+        else:
             pygame.draw.circle(circle_surface, (255, 0, 0, 128), (100, 100), 100)
             scrn.blit(img_base_rat, (mouse[0] - 25, mouse[1] - 25))
             scrn.blit(circle_surface, (mouse[0] - 100, mouse[1] - 100))
     elif tower == "rattent":
         img_base_tent = load_image("assets/base_camp.png")
         circle_surface = pygame.Surface((100, 100), pygame.SRCALPHA)
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return True
-        if check_hitbox(house_hitbox, relative_pos, towers):
+        if inputs.dispatcher.key_pressed(pygame.K_ESCAPE):
+            return True
+        if check_hitbox(relative_pos):
             pygame.draw.circle(circle_surface, (0, 0, 0, 128), (50, 50), 50)
             scrn.blit(img_base_tent, (mouse[0] - 25, mouse[1] - 25))
             scrn.blit(circle_surface, (mouse[0] - 50, mouse[1] - 50))
-        elif not check_hitbox(house_hitbox, relative_pos, towers):
+        else:
             pygame.draw.circle(circle_surface, (255, 0, 0, 128), (50, 50), 50)
             scrn.blit(img_base_tent, (mouse[0] - 25, mouse[1] - 25))
             scrn.blit(circle_surface, (mouse[0] - 50, mouse[1] - 50))
         if within_spawn_point((mouse[0], mouse[1]), recruit_path, radius=50):
-            checkpath_font = get_font("arial", 16)
-            text_checkpath = checkpath_font.render("Eligible Path", True, (0, 255, 0))
-            scrn.blit(text_checkpath, (mouse[0] - 35, mouse[1] + 50))
-        elif not within_spawn_point((mouse[0], mouse[1]), recruit_path, radius=50):
-            checkpath_font = get_font("arial", 16)
-            text_checkpath = checkpath_font.render("Ineligible Path", True, (255, 0, 0))
-            scrn.blit(text_checkpath, (mouse[0] - 35, mouse[1] + 50))
-        if detect_single_click() and check_hitbox(house_hitbox, relative_pos, tower):
-            tower_rattent = RatTent((mouse[0], mouse[1]))
-            towers.append(tower_rattent)
+            text_checkpath = hud.text_cache.render("checkpath", "Eligible Path", "arial", 16, (0, 255, 0))
+        else:
+            text_checkpath = hud.text_cache.render("checkpath", "Ineligible Path", "arial", 16, (255, 0, 0))
+        scrn.blit(text_checkpath, (mouse[0] - 35, mouse[1] + 50))
+        if detect_single_click() and check_hitbox(relative_pos):
+            tower_rattent = create_tower("rattent", (mouse[0], mouse[1]))
+            add_tower(tower_rattent)
             tower_click.play()
-            play_splash_animation(scrn, (mouse[0], mouse[1]))
-            money -= 650
+            play_splash_animation((mouse[0], mouse[1]))
+            money -= tower_rattent.cost
             return True
     elif tower == "ozbourne":
         img_base_ozbourne = load_image("assets/alfredo_ozbourne_base.png")
         circle_surface = pygame.Surface((150, 150), pygame.SRCALPHA)
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return True
-        if check_hitbox(house_hitbox, relative_pos, towers):
+        if inputs.dispatcher.key_pressed(pygame.K_ESCAPE):
+            return True
+        if check_hitbox(relative_pos):
             pygame.draw.circle(circle_surface, (0, 0, 0, 128), (75, 75), 75)
             scrn.blit(img_base_ozbourne, (mouse[0] - 25, mouse[1] - 25))
             scrn.blit(circle_surface, (mouse[0] - 75, mouse[1] - 75))
-        elif not check_hitbox(house_hitbox, relative_pos, towers):
+        else:
             pygame.draw.circle(circle_surface, (255, 0, 0, 128), (75, 75), 75)
             scrn.blit(img_base_ozbourne, (mouse[0] - 25, mouse[1] - 25))
             scrn.blit(circle_surface, (mouse[0] - 75, mouse[1] - 75))
-        if detect_single_click() and check_hitbox(house_hitbox, relative_pos, tower):
-            tower_ozbourne = Ozbourne((mouse[0], mouse[1]), radius=100, weapon="guitar", damage=1, riff_blast_radius=75,
-                                      image_path="assets/alfredo_ozbourne_base.png")
-            towers.append(tower_ozbourne)
+        if detect_single_click() and check_hitbox(relative_pos):
+            tower_ozbourne = create_tower("ozbourne", (mouse[0], mouse[1]))
+            add_tower(tower_ozbourne)
             tower_click.play()
-            play_splash_animation(scrn, (mouse[0], mouse[1]))
-            money -= 500
+            play_splash_animation((mouse[0], mouse[1]))
+            money -= tower_ozbourne.cost
             return True
-    if detect_single_click() and check_hitbox(house_hitbox, relative_pos, tower) and tower == "mrcheese":
-        tower_mrcheese = MrCheese((mouse[0], mouse[1]), radius=75, weapon="Cheese", damage=1,
-                                  image_path="assets/base_rat.png", projectile_image="assets/projectile_cheese.png")
-        towers.append(tower_mrcheese)
+    if detect_single_click() and check_hitbox(relative_pos) and tower == "mrcheese":
+        tower_mrcheese = create_tower("mrcheese", (mouse[0], mouse[1]))
+        add_tower(tower_mrcheese)
         tower_click.play()
-        play_splash_animation(scrn, (mouse[0], mouse[1]))
-        money -= 150
+        play_splash_animation((mouse[0], mouse[1]))
+        money -= tower_mrcheese.cost
         return True
     return False
 
+
+def create_tower(tower: str, position: tuple):
+    """
+    Builds a tower exactly as it is placed from the in-game menu
+    :param tower: "mrcheese", "rattent" or "ozbourne"
+    :param position: (x, y) center of the tower
+    :return: Tower
+    """
+    if tower == "mrcheese":
+        return tower_types.MrCheese(position, radius=75, weapon="Cheese", damage=1,
+                                    image_path="assets/base_rat.png", projectile_image="assets/projectile_cheese.png")
+    elif tower == "rattent":
+        return tower_types.RatTent(position)
+    elif tower == "ozbourne":
+        return tower_types.Ozbourne(position, radius=100, weapon="guitar", damage=1, riff_blast_radius=75,
+                                    image_path="assets/alfredo_ozbourne_base.png")
+    raise ValueError(f"Unknown tower type: {tower}")
+
 class RecruitEntity:
-    img_recruit_death = load_image("assets/splatter_recuit.png")
+    @property
+    def img_recruit_death(self):
+        return load_image("assets/splatter_recuit.png")
 
     def __init__(self, position, health, speed, path, damage, image_path):
         self.health = health
         self.speed = speed
         self.path = path
+        self.path_table = paths.get_path_table(path)
         self.damage = damage
         self.image = load_image(image_path)
         self.original_image = self.image
-        self.rect = self.image.get_rect(center=position)
-        self.position, self.current_target = self.get_closest_point_on_path(position)
+        # Recruits join the path at its closest point and track their distance along it
+        self.progress, self.position = self.path_table.project(position)
+        self.rect = self.image.get_rect(center=self.position)
         self.is_alive = True
         self.was_alive = False
 
     def get_closest_point_on_path(self, position):
-        closest_point = None
-        min_distance = float('inf')
-        best_index = 0
-        for i in range(len(self.path) - 1):
-            p1, p2 = self.path[i], self.path[i + 1]
-            px, py = self.closest_point_on_segment(position, p1, p2)
-            distance = ((px - position[0]) ** 2 + (py - position[1]) ** 2) ** 0.5
-            if distance < min_distance:
-                min_distance = distance
-                closest_point = (px, py)
-                best_index = i + 1
-        return closest_point, best_index
-
-    def closest_point_on_segment(self, p, p1, p2):
-        x, y = p
-        x1, y1 = p1
-        x2, y2 = p2
-        dx, dy = x2 - x1, y2 - y1
-        if dx == dy == 0:
-            return p1
-        t = max(0, min(1, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
-        return (x1 + t * dx, y1 + t * dy)
+        distance, closest_point = self.path_table.project(position)
+        return closest_point, self.path_table.segment_at(distance) + 1
 
     def move(self):
-        if self.current_target < len(self.path):
-            target_x, target_y = self.path[self.current_target]
-            dx = target_x - self.position[0]
-            dy = target_y - self.position[1]
-            distance = (dx ** 2 + dy ** 2) ** 0.5
-            if distance == 0:
-                return
-            direction_x = dx / distance
-            direction_y = dy / distance
-            self.position = (
-                self.position[0] + direction_x * self.speed,
-                self.position[1] + direction_y * self.speed
-            )
+        if self.progress < self.path_table.total:
+            self.progress += self.speed
+            self.position, heading = self.path_table.locate(self.progress)
             self.rect.center = self.position
-            self.update_orientation(direction_x, direction_y)
-            if distance <= self.speed:
-                self.current_target += 1
-        if self.current_target >= len(self.path):
+            self.update_orientation(heading)
+        if self.progress >= self.path_table.total:
             self.is_alive = False
 
-    def update_orientation(self, direction_x, direction_y):
-        angle = math.degrees(math.atan2(-direction_y, direction_x))
-        self.image = pygame.transform.rotate(self.original_image, angle - 90)
+    def update_orientation(self, heading):
+        self.image = get_rotated(self.original_image, heading - 90)
         self.rect = self.image.get_rect(center=self.rect.center)
 
     def check_collision(self, enemies):
@@ -720,21 +852,36 @@ class RecruitEntity:
 
 
 class Projectile:
-    def __init__(self, position, target, speed, damage, image_path):
-        self.position = list(position)
-        self.target = target
+    """
+    Slotted projectile that is recycled through ProjectilePool instead of
+    being allocated per shot; reset() re-aims it in place.
+    """
+    __slots__ = ("position", "target", "speed", "damage", "image", "rect", "hit", "penetration")
+
+    def __init__(self, position=(0, 0), target=None, speed=0, damage=0, image_path=None):
+        self.position = [0.0, 0.0]
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.image = None
+        if image_path is not None:
+            self.reset(position, target, speed, damage, image_path)
+
+    def reset(self, position, target, speed, damage, image_path):
+        self.position[0], self.position[1] = position
+        self.target = target.entity_id  # resolved through the enemy registry, so removed enemies aren't chased
         self.speed = speed
         self.damage = damage
         self.image = load_image(image_path)
-        self.rect = self.image.get_rect(center=position)
+        self.rect.size = self.image.get_size()
+        self.rect.center = position
         self.hit = False
         self.penetration = 0
 
     def move(self):
-        if not self.target.is_alive:
+        target = enemies.get(self.target)
+        if target is None or not target.is_alive:
             self.hit = True
             return
-        target_x, target_y = self.target.position
+        target_x, target_y = target.position
         dx = target_x - self.position[0]
         dy = target_y - self.position[1]
         distance = math.sqrt(dx ** 2 + dy ** 2)
@@ -751,45 +898,83 @@ class Projectile:
         screen.blit(self.image, self.rect.topleft)
 
 
+class ProjectilePool:
+    """
+    Preallocated Projectiles handed out from a free list. live/peak/reuses
+    are kept for tuning the initial size.
+    """
+
+    def __init__(self, size=256):
+        self._free = [Projectile() for _ in range(size)]
+        self.allocated = size
+        self.live = 0
+        self.peak = 0
+        self.reuses = 0
+
+    def acquire(self, position, target, speed, damage, image_path) -> Projectile:
+        if self._free:
+            projectile = self._free.pop()
+            self.reuses += 1
+        else:
+            projectile = Projectile()
+            self.allocated += 1
+        projectile.reset(position, target, speed, damage, image_path)
+        self.live += 1
+        self.peak = max(self.peak, self.live)
+        return projectile
+
+    def release(self, projectile: Projectile):
+        projectile.target = None  # don't keep dead enemies alive through the pool
+        self._free.append(projectile)
+        self.live -= 1
+
+    def stats(self) -> dict:
+        return {"live": self.live, "peak": self.peak, "reuses": self.reuses,
+                "allocated": self.allocated, "free": len(self._free)}
+
+
+projectile_pool = ProjectilePool()
+
+
+def swap_remove(items: list, index: int):
+    """
+    Removes items[index] in O(1) by moving the last item into its place
+    :return: the removed item
+    """
+    last = items.pop()
+    if index < len(items):
+        removed = items[index]
+        items[index] = last
+        return removed
+    return last
+
+
 class RatRecruit:
     def __init__(self, position, health, speed, path, image_path):
-        self.position = position
         self.health = health
         self.speed = speed
         self.path = path
+        self.path_table = paths.get_path_table(path)
         self.original_image = load_image(image_path)
         self.image = self.original_image
-        self.rect = self.image.get_rect(center=position)
+        self.progress, self.position = self.path_table.project(position)
+        self.rect = self.image.get_rect(center=self.position)
         self.size = self.rect.size
-        self.current_target = 0
         self.is_alive = True
 
     def move(self):
         global user_health
-        if self.current_target < len(self.path):
-            target_x, target_y = self.path[self.current_target]
-            dx = target_x - self.position[0]
-            dy = target_y - self.position[1]
-            distance = (dx ** 2 + dy ** 2) ** 0.5
-            if distance == 0:
-                return
-            direction_x = dx / distance
-            direction_y = dy / distance
-            self.position = (
-                self.position[0] + direction_x * self.speed,
-                self.position[1] + direction_y * self.speed
-            )
+        if self.progress < self.path_table.total:
+            self.progress += self.speed
+            self.position, heading = self.path_table.locate(self.progress)
             self.rect.center = self.position
-            self.update_orientation(direction_x, direction_y)
-            if distance <= self.speed:
-                self.current_target += 1
-        if self.current_target >= len(self.path):
+            self.update_orientation(heading)
+        if self.progress >= self.path_table.total:
             self.is_alive = False
             user_health -= self.health
 
-    def update_orientation(self, direction_x, direction_y):
-        angle = math.degrees(math.atan2(-direction_y, direction_x))
-        self.image = pygame.transform.rotate(self.original_image, angle - 90)
+    def update_orientation(self, heading):
+        self.image = get_rotated(self.original_image, heading - 90)
         self.rect = self.image.get_rect(center=self.rect.center)
 
     def render(self, screen):
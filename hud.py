@@ -0,0 +1,68 @@
+import pygame
+import game_tools
+
+
+class TextCache:
+    """
+    Remembers the last surface rendered for each HUD label and only calls the
+    font rasterizer again when the label's text changes.
+    """
+
+    def __init__(self):
+        self._labels = {}  # label -> (text, font key, color, surface)
+
+    def render(self, label, text, font_name, size, color) -> pygame.Surface:
+        cached = self._labels.get(label)
+        if cached is not None and cached[0] == text and cached[1] == (font_name, size) and cached[2] == color:
+            return cached[3]
+        surface = game_tools.get_font(font_name, size).render(text, True, color)
+        self._labels[label] = (text, (font_name, size), color, surface)
+        return surface
+
+
+class DigitAtlas:
+    """
+    Glyphs for 0-9, '-' and '.' rendered once for one font and color, so
+    counters that change every frame are drawn by blitting digits instead of
+    rasterizing a new string.
+    """
+    GLYPHS = "0123456789-."
+
+    def __init__(self, font_name, size, color):
+        self.font = game_tools.get_font(font_name, size)
+        self.color = color
+        self.glyphs = {}
+        for char in self.GLYPHS:
+            self._add(char)
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def _add(self, char) -> pygame.Surface:
+        glyph = self.font.render(char, True, self.color)
+        self.glyphs[char] = glyph
+        return glyph
+
+    def blit(self, scrn: pygame.Surface, value, pos) -> pygame.Rect:
+        """
+        Draws value at pos from the cached glyphs
+        :param scrn: pygame.Surface
+        :param value: number (or any text, unknown characters are rendered once and kept)
+        :param pos: top left (x, y)
+        :return: pygame.Rect covering the drawn text
+        """
+        x, y = pos
+        for char in str(value):
+            glyph = self.glyphs.get(char) or self._add(char)
+            scrn.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
+
+
+text_cache = TextCache()
+_atlas_cache = {}
+
+
+def get_digit_atlas(name, size, color) -> DigitAtlas:
+    key = (name, size, color)
+    if key not in _atlas_cache:
+        _atlas_cache[key] = DigitAtlas(name, size, color)
+    return _atlas_cache[key]
@@ -0,0 +1,77 @@
+import pygame
+
+
+class InputEvent:
+    """A pygame event stamped with the time it was taken off the queue."""
+    __slots__ = ("type", "time", "event", "consumed")
+
+    def __init__(self, event, time):
+        self.type = event.type
+        self.time = time
+        self.event = event
+        self.consumed = False
+
+    def __getattr__(self, name):
+        return getattr(self.event, name)
+
+
+class InputDispatcher:
+    """
+    The only place that reads the pygame event queue. pump() drains it once
+    per frame, stamps each event and hands it to the handlers subscribed to
+    its type, which are for input that applies in every screen. Menus and
+    map UI poll the frame's events instead, through clicked() and
+    key_pressed(), for the rest of the frame.
+    """
+
+    def __init__(self):
+        self.handlers = {}  # event type -> list of handlers
+        self.events = []  # this frame's InputEvents
+        self.last_click_time = -1000000
+
+    def subscribe(self, event_type, handler):
+        """Calls handler(InputEvent) for every event of event_type."""
+        self.handlers.setdefault(event_type, []).append(handler)
+
+    def unsubscribe(self, event_type, handler):
+        self.handlers.get(event_type, []).remove(handler)
+
+    def pump(self) -> list:
+        """
+        Drains the event queue and dispatches the events. Called once per frame.
+        :return: list of this frame's InputEvents
+        """
+        now = pygame.time.get_ticks()
+        self.events = [InputEvent(event, now) for event in pygame.event.get()]
+        for event in self.events:
+            for handler in self.handlers.get(event.type, ()):
+                handler(event)
+        return self.events
+
+    def clicked(self, delay=300) -> bool:
+        """
+        True for the first caller in a frame with a new left click. The click is
+        consumed, so later checks in the same frame don't act on it again.
+        :param delay: milliseconds a click is ignored after the last accepted one
+        :return: bool
+        """
+        for event in self.events:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not event.consumed:
+                event.consumed = True
+                if event.time - self.last_click_time >= delay:
+                    self.last_click_time = event.time
+                    return True
+        return False
+
+    def key_pressed(self, key) -> bool:
+        """True if key went down this frame."""
+        return any(event.type == pygame.KEYDOWN and event.key == key for event in self.events)
+
+
+def quit_game(event=None):
+    pygame.quit()
+    exit()
+
+
+dispatcher = InputDispatcher()
+dispatcher.subscribe(pygame.QUIT, quit_game)
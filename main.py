@@ -1,134 +1,173 @@
 # Example file showing a basic pygame "game loop"
+import time
 import pygame
 from pygame import mixer
 import mainmenu
 import game_tools
+import inputs
 from save_progress import (save_data, load_data)
 from waves import (send_wave, start_new_wave)
+from renderer import DirtyRectScreen
+import assets
+from profiling import profiler
+
+DIRTY_RECTS = True  # False redraws and flips the full map every frame, for comparison
+SHOW_FRAME_GRAPH = False  # frame-time graph instead of the debug text, F3 toggles it and F4 records a trace
+REPORT_STARTUP = False  # print the time from the end of the imports to the first menu frame
+
+startup_time = time.perf_counter()  # once the modules are imported
+
+
+def main():
+    # pygame setup
+    screen = game_tools.init(display=True, audio=True)
+    # change the window screen title
+    pygame.display.set_caption('YummyTD')
+    Icon = pygame.image.load('assets/icon.png')
+    pygame.display.set_icon(Icon)
+    mixer.music.load("assets/menu_music.mp3")
+    mixer.music.set_volume(0.15)
+    clock = pygame.time.Clock()
+    running = True
+    state = "Menu"
+    resumeFlag = False
+    mixer.music.play(loops=-1)
+    curr_wave = False
+    round_number = 17   # change for debugging
+    PlayFlag = True
+    first_menu_frame = True
+
+    profiler.show_graph = SHOW_FRAME_GRAPH
+    inputs.dispatcher.subscribe(pygame.KEYDOWN, profiler.handle_key)
+
+    assets.load_scene(screen, "menu")
+
+    while running:
+        # poll for events
+        # pygame.QUIT event means the user clicked X to close your window, handled by inputs.quit_game
+        inputs.dispatcher.pump()
+
+        # MAIN MENU
+        if state == "Menu":
+            # full paint once, after that the menu only pushes buttons that change
+            mainmenu.render_mainmenu(screen)
+            if first_menu_frame:
+                first_menu_frame = False
+                if REPORT_STARTUP:
+                    print(f"First menu frame after {(time.perf_counter() - startup_time) * 1000:.0f} ms")
+                # decode the next scenes while the player is in the menus
+                assets.loader.request("play")
+                assets.loader.request("map")
+
+        while state == "Menu":
+            inputs.dispatcher.pump()
+
+            assets.loader.poll()
+            playFlag = mainmenu.mainmenu_control(screen)
+            if playFlag:
+                state = "Play"
+            clock.tick(60)  # limits FPS to 60
+
+        # GAME SELECT
+        if state == "Play":
+            assets.load_scene(screen, "play")
+            mainmenu.render_playscreen(screen, resumeFlag)
+            tower = "NULL"
+            exit_new_tower = True
+
+        while state == "Play":
+            inputs.dispatcher.pump()
+
+            assets.loader.poll()
+            option = mainmenu.playscreen_control(screen, resumeFlag)
+            if option == "close":
+                state = "Menu"
+            if option == "New":
+                state = "New Game"
+            clock.tick(60)  # limits FPS to 60
+
+        if state == "New Game":
+            assets.load_scene(screen, "map")
+            game_tools.prewarm_rotations()
+            # the cutscene isn't needed until the mog triggers, keep decoding it during play
+            assets.loader.request("mog")
+            game_tools.fade_into_image("assets/house_map_baselayer.png", 500)
+            image_map = game_tools.load_image("assets/house_map_baselayer.png")
+            map_screen = DirtyRectScreen(screen, image_map, full_frame=not DIRTY_RECTS)
+            start_new_wave(round_number)
+            mixer.music.fadeout(1000)
+            mixer.music.load("assets/map_music.mp3")
+            mixer.music.play(-1)
+            # save current new game data
+            # this will overwrite any previous saves
+            # save_data(game_tools.towers, "towers.pkl")
+            # save_data(game_tools.user_health, "health.pkl")
+            # save_data(round_number, "round_number.pkl")
+            # save_data(game_tools.money, "money.pkl")
+            # load new game values (default)
+            # game_tools.towers = load_data("towers.pkl")
+            # game_tools.user_health = load_data("health.pkl")
+            # game_tools.money = load_data("money.pkl")
+            # round_number = load_data("round_number.pkl")
+
+        while state == "New Game":
+            profiler.begin_frame()
+            with profiler.section("render"):
+                map_screen.begin_frame()
+            assets.loader.poll()
+            with profiler.section("input"):
+                inputs.dispatcher.pump()
+
+            with profiler.section("towers"):
+                game_tools.update_towers(map_screen)
+            with profiler.section("render"):
+                game_tools.update_stats(map_screen, game_tools.user_health, game_tools.money, round_number, clock)
+
+            # cutscenes cover the map, the game keeps running underneath but ignores the player
+            with profiler.section("input"):
+                if not game_tools.timeline.modal:
+                    cursor_select = game_tools.check_game_menu_elements(map_screen)
+                    if cursor_select is not ("NULL" or "nextround"):
+                        tower = cursor_select
+                        exit_new_tower = False
+
+                    if not exit_new_tower:
+                        exit_new_tower = game_tools.handle_newtower(map_screen, tower)
+
+            if game_tools.RoundFlag:
+                mixer.music.set_volume(0.35)
+                with profiler.section("waves"):
+                    curr_wave = send_wave(map_screen, round_number)
+                if curr_wave:
+                    mixer.music.set_volume(0.10)
+                    game_tools.RoundFlag = False
+                    round_number += 1
+                    # save new state after starting new round
+                    # save_data(game_tools.towers, "towers.pkl")
+                    # Towers can't be pickled!! will need to use .json eventually
+                    # save_data(game_tools.user_health, "health.pkl")
+                    # save_data(round_number, "round_number.pkl")
+                    # save_data(game_tools.money, "money.pkl")
+                    start_new_wave(round_number)
+                    cursor_select = "NULL"
+
+            if game_tools.MogFlag:
+                game_tools.play_mog_animation()
+                game_tools.MogFlag = False
+
+            with profiler.section("render"):
+                game_tools.timeline.update(map_screen, game_tools.get_ticks())
+            with profiler.section("audio"):
+                game_tools.sfx.flush()
+            with profiler.section("flip"):
+                map_screen.end_frame()
+            profiler.end_frame()
+            clock.tick(60)  # limits FPS to 60
 
-# pygame setup
-
-# change the window screen title
-pygame.display.set_caption('YummyTD')
-Icon = pygame.image.load('assets/icon.png')
-pygame.display.set_icon(Icon)
-pygame.init()
-mixer.init()
-mixer.music.load("assets/menu_music.mp3")
-mixer.music.set_volume(0.15)
-screen = pygame.display.set_mode((1280, 720))
-clock = pygame.time.Clock()
-running = True
-state = "Menu"
-resumeFlag = False
-mixer.music.play(loops=-1)
-curr_wave = False
-round_number = 17   # change for debugging
-PlayFlag = True
-
-while running:
-    # poll for events
-    # pygame.QUIT event means the user clicked X to close your window
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-
-    # MAIN MENU
-    while state == "Menu":
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        # fill the screen with a color to wipe away anything from last frame
-        screen.fill("purple")
-        mainmenu.render_mainmenu(screen)
-        playFlag = mainmenu.mainmenu_control(screen)
-        if playFlag:
-            state = "Play"
-        # flip() the display to put your work on screen
         pygame.display.flip()
-        clock.tick(60)  # limits FPS to 60
-
-    # GAME SELECT
-    if state == "Play":
-        img_play_screen = pygame.image.load("assets/play_screen.png").convert_alpha()
-        screen.blit(img_play_screen, (0, 0))
-        tower = "NULL"
-        exit_new_tower = True
-
-    while state == "Play":
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        option = mainmenu.playscreen_control(screen, resumeFlag)
-        if option == "close":
-            state = "Menu"
-        if option == "New":
-            state = "New Game"
-        pygame.display.flip()
-        clock.tick(60)  # limits FPS to 60
-
-    if state == "New Game":
-        game_tools.fade_into_image(screen, "assets/house_map_baselayer.png", 500)
-        image_map = pygame.image.load("assets/house_map_baselayer.png").convert_alpha()
-        start_new_wave(round_number)
-        mixer.music.fadeout(1000)
-        mixer.music.load("assets/map_music.mp3")
-        mixer.music.play(-1)
-        # save current new game data
-        # this will overwrite any previous saves
-        # save_data(game_tools.towers, "towers.pkl")
-        # save_data(game_tools.user_health, "health.pkl")
-        # save_data(round_number, "round_number.pkl")
-        # save_data(game_tools.money, "money.pkl")
-        # load new game values (default)
-        # game_tools.towers = load_data("towers.pkl")
-        # game_tools.user_health = load_data("health.pkl")
-        # game_tools.money = load_data("money.pkl")
-        # round_number = load_data("round_number.pkl")
-
-    while state == "New Game":
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        game_tools.update_towers(screen)
-        game_tools.update_stats(screen, game_tools.user_health, game_tools.money, round_number, clock)
-
-        cursor_select = game_tools.check_game_menu_elements(screen)
-        if cursor_select is not ("NULL" or "nextround"):
-            tower = cursor_select
-            exit_new_tower = False
-
-        if not exit_new_tower:
-            exit_new_tower = game_tools.handle_newtower(screen, tower)
-
-        if game_tools.RoundFlag:
-            mixer.music.set_volume(0.35)
-            curr_wave = send_wave(screen, round_number)
-            if curr_wave:
-                mixer.music.set_volume(0.10)
-                game_tools.RoundFlag = False
-                round_number += 1
-                # save new state after starting new round
-                # save_data(game_tools.towers, "towers.pkl")
-                # Towers can't be pickled!! will need to use .json eventually
-                # save_data(game_tools.user_health, "health.pkl")
-                # save_data(round_number, "round_number.pkl")
-                # save_data(game_tools.money, "money.pkl")
-                start_new_wave(round_number)
-                cursor_select = "NULL"
-
-        if game_tools.MogFlag:
-            game_tools.play_mog_animation(screen)
-            game_tools.MogFlag = False
-            mixer.music.unpause()
+        clock.tick(60)
+    pygame.quit()
 
-        pygame.display.flip()
-        screen.blit(image_map, (0, 0))
-        clock.tick(60)  # limits FPS to 60
 
-    pygame.display.flip()
-    clock.tick(60)
-pygame.quit()
+if __name__ == "__main__":
+    main()
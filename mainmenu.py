@@ -1,42 +1,131 @@
 import pygame
 from pygame import mixer
+import game_tools
+import inputs
 
 
-def render_mainmenu(scrn: pygame.Surface):
+class MenuScreen:
     """
-    Draws the main menu screen
-    :param scrn: pygame.Surface
-    :return: none
+    A menu screen whose static layers are decoded once and pre-composed into a
+    single surface. Each frame only the buttons whose hover state changed are
+    repainted and pushed to the display.
     """
 
-    font1 = pygame.font.SysFont('chalkduster.ttf', 20)
-    version = font1.render('Version 1.0.0', True, (0, 255, 0))
-    text_rect1 = version.get_rect()
-    scrn.blit(version, text_rect1)
-
-    # Draw menu background
-    img_menu = pygame.image.load("assets/menu_background.png").convert()
-
-    # Logo
-    img_logo = pygame.image.load("assets/mainmenu_logo.png").convert_alpha()
-
-    # Play button screen
-    img_play = pygame.image.load("assets/mainmenu_play.png").convert_alpha()
-
-    # Quit button screen
-    img_quit = pygame.image.load("assets/mainmenu_quit.png").convert_alpha()
-
-    # render background
-    scrn.blit(img_menu, (0, 0))
+    def __init__(self, layers):
+        """
+        :param layers: list of (image path, position) drawn bottom to top
+        """
+        self.layers = layers
+        self.base = None
+        self.buttons = {}  # name -> (hit box, hovered image path or None)
+        self.hovered = {}
+
+    def add_button(self, name, hit_box, hovered_image=None):
+        """
+        :param name: key used with is_hovered()
+        :param hit_box: (x, y, w, h), edges inclusive like the original bounds checks
+        :param hovered_image: image drawn over the button while hovered
+        """
+        self.buttons[name] = (hit_box, hovered_image)
+        self.hovered[name] = False
+
+    def compose(self) -> pygame.Surface:
+        if self.base is None:
+            self.base = pygame.Surface((1280, 720)).convert()
+            for path, pos in self.layers:
+                self.base.blit(game_tools.load_image(path), pos)
+        return self.base
+
+    def draw(self, scrn: pygame.Surface):
+        """
+        Paints the whole screen, used when the menu is entered
+        :param scrn: pygame.Surface
+        :return: none
+        """
+        scrn.blit(self.compose(), (0, 0))
+        mouse = pygame.mouse.get_pos()
+        for name in self.buttons:
+            self.hovered[name] = self._hit(name, mouse)
+            self._paint(scrn, name)
+        pygame.display.flip()
+
+    def update(self, scrn: pygame.Surface, mouse: tuple) -> list:
+        """
+        Repaints and pushes only the buttons whose hover state changed
+        :param scrn: pygame.Surface
+        :param mouse: cursor position
+        :return: list of updated rects
+        """
+        dirty = []
+        for name in self.buttons:
+            hovered = self._hit(name, mouse)
+            if hovered != self.hovered[name]:
+                self.hovered[name] = hovered
+                dirty.append(self._paint(scrn, name))
+        if dirty:
+            pygame.display.update(dirty)
+        return dirty
+
+    def is_hovered(self, name) -> bool:
+        return self.hovered[name]
+
+    def _hit(self, name, mouse) -> bool:
+        (x, y, w, h), _ = self.buttons[name]
+        return x <= mouse[0] <= x + w and y <= mouse[1] <= y + h
+
+    def _paint(self, scrn, name) -> pygame.Rect:
+        hit_box, hovered_image = self.buttons[name]
+        if hovered_image is None:
+            return pygame.Rect(hit_box)
+        image = game_tools.load_image(hovered_image)
+        rect = image.get_rect(topleft=hit_box[:2])
+        scrn.blit(self.compose(), rect, rect)
+        if self.hovered[name]:
+            scrn.blit(image, rect)
+        return rect
+
+
+_main_menu = None
+_play_screens = {}
+
+
+def get_main_menu() -> MenuScreen:
+    global _main_menu
+    if _main_menu is None:
+        _main_menu = MenuScreen([("assets/menu_background.png", (0, 0)),
+                                 ("assets/mainmenu_play.png", (502, 555)),
+                                 ("assets/mainmenu_quit.png", (502, 635)),
+                                 ("assets/mainmenu_logo.png", (384, 40))])
+        _main_menu.add_button("play", (502, 555, 275, 75), "assets/mainmenu_play_hovered.png")
+        _main_menu.add_button("quit", (502, 635, 275, 75), "assets/mainmenu_quit_hovered.png")
+    return _main_menu
+
+
+def get_play_screen(resume_flag: bool) -> MenuScreen:
+    if resume_flag not in _play_screens:
+        layers = [("assets/play_screen.png", (0, 0)),
+                  ("assets/play_newgame.png", (222, 310)),
+                  ("assets/play_resumegame.png", (565, 310)),
+                  ("assets/play_options.png", (893, 310))]
+        if not resume_flag:
+            layers.append(("assets/play_resumegame_unavailable.png", (565, 310)))
+        play_screen = MenuScreen(layers)
+        play_screen.add_button("close", (171, 223, 52, 60))
+        play_screen.add_button("new", (222, 310, 220, 170), "assets/play_newgame_hovered.png")
+        if resume_flag:
+            play_screen.add_button("resume", (565, 310, 220, 170), "assets/play_resumegame_pressed.png")
+        play_screen.add_button("options", (893, 310, 220, 170), "assets/play_options_pressed.png")
+        _play_screens[resume_flag] = play_screen
+    return _play_screens[resume_flag]
 
-    # render play button
-    scrn.blit(img_play, (502, 555))
 
-    # render quit button
-    scrn.blit(img_quit, (502, 635))
-
-    # render logo
-    scrn.blit(img_logo, (384, 40))
+def render_mainmenu(scrn: pygame.Surface):
+    """
+    Draws the main menu screen, called once when the menu is entered
+    :param scrn: pygame.Surface
+    :return: none
+    """
+    get_main_menu().draw(scrn)
 
 
 def mainmenu_control(scrn: pygame.Surface) -> bool:
@@ -44,86 +133,52 @@ def mainmenu_control(scrn: pygame.Surface) -> bool:
     tracks cursor position on menu and controls menu elements
     :return: bool
     """
-    hover_play = pygame.image.load(
-        "assets/mainmenu_play_hovered.png").convert_alpha()
-    hover_quit = pygame.image.load(
-        "assets/mainmenu_quit_hovered.png").convert_alpha()
-    img_play = pygame.image.load("assets/mainmenu_play.png").convert_alpha()
-    img_quit = pygame.image.load("assets/mainmenu_quit.png").convert_alpha()
-    button_press = pygame.mixer.Sound("assets/button_press.mp3")
-
-    click = False
-
-    for ev in pygame.event.get():
-        if ev.type == pygame.QUIT:
-            pygame.quit()
-            exit()
+    menu = get_main_menu()
+    button_press = game_tools.load_sound("assets/button_press.mp3")
 
     mouse = pygame.mouse.get_pos()
-    click = pygame.mouse.get_pressed()[0]
+    click = inputs.dispatcher.clicked()
+    menu.update(scrn, mouse)
 
-    if 502 <= mouse[0] <= 777 and 555 <= mouse[1] <= (555 + 75):
-        scrn.blit(hover_play, (502, 555))
-        if click:
-            button_press.play()
-            return True
-    else:
-        scrn.blit(img_play, (502, 555))
+    if menu.is_hovered("play") and click:
+        button_press.play()
+        return True
 
-    if 502 <= mouse[0] <= 777 and 635 <= mouse[1] <= (635 + 75):
-        scrn.blit(hover_quit, (502, 635))
-        if click:
-            button_press.play()
-            pygame.quit()
-            exit()
-    else:
-        scrn.blit(img_quit, (502, 635))
+    if menu.is_hovered("quit") and click:
+        button_press.play()
+        inputs.quit_game()
 
     return False
 
 
+def render_playscreen(scrn: pygame.Surface, resume_flag: bool):
+    """
+    Draws the game select screen, called once when it is entered
+    :param scrn: pygame.Surface
+    :param resume_flag: whether there is a game to resume
+    :return: none
+    """
+    get_play_screen(resume_flag).draw(scrn)
+
+
 def playscreen_control(scrn: pygame.Surface, resume_flag: bool) -> str:
     """
     tracks cursor position on menu and controls menu elements
     :return: str
     """
-    # load assets
-    button_press = pygame.mixer.Sound("assets/button_press.mp3")
-    img_newgame = pygame.image.load("assets/play_newgame.png").convert_alpha()
-    img_resumegame = pygame.image.load("assets/play_resumegame.png").convert_alpha()
-    img_options = pygame.image.load("assets/play_options.png").convert_alpha()
-    scrn.blit(img_newgame, (222, 310))
-    scrn.blit(img_resumegame, (565, 310))
-    scrn.blit(img_options, (893, 310))
-    img_newgame_hovered = pygame.image.load(
-        "assets/play_newgame_hovered.png").convert_alpha()
-    img_resumegame_hovered = pygame.image.load(
-        "assets/play_resumegame_pressed.png").convert_alpha()
-    img_resumegame_unavailable = pygame.image.load(
-        "assets/play_resumegame_unavailable.png").convert_alpha()
-    img_option_hovered = pygame.image.load(
-        "assets/play_options_pressed.png").convert_alpha()
-
-    if not resume_flag:
-        scrn.blit(img_resumegame_unavailable, (565, 310))
-
-    click = False
-
-    for ev in pygame.event.get():
-        if ev.type == pygame.QUIT:
-            pygame.quit()
-            exit()
+    play_screen = get_play_screen(resume_flag)
+    button_press = game_tools.load_sound("assets/button_press.mp3")
 
     mouse = pygame.mouse.get_pos()
-    click = pygame.mouse.get_pressed()[0]
+    click = inputs.dispatcher.clicked()
+    play_screen.update(scrn, mouse)
 
-    if 171 <= mouse[0] <= (171 + 52) and 223 <= mouse[1] <= (223 + 60):
+    if play_screen.is_hovered("close"):
         if click:
             button_press.play()
             return "close"
 
-    if 222 <= mouse[0] <= (222 + 220) and 310 <= mouse[1] <= (310 + 170):
-        scrn.blit(img_newgame_hovered, (222, 310))
+    if play_screen.is_hovered("new"):
         if click and resume_flag:
             button_press.play()
             # add warning
@@ -132,17 +187,12 @@ def playscreen_control(scrn: pygame.Surface, resume_flag: bool) -> str:
             button_press.play()
             return "New"
 
-    if 565 <= mouse[0] <= (565 + 220) and 310 <= mouse[1] <= (310 + 170) and resume_flag:
-        scrn.blit(img_resumegame_hovered, (565, 310))
+    if resume_flag and play_screen.is_hovered("resume"):
         if click:
             button_press.play()
             return "close"
 
-    if 893 <= mouse[0] <= (893 + 220) and 310 <= mouse[1] <= (310 + 170):
-        scrn.blit(img_option_hovered, (893, 310))
+    if play_screen.is_hovered("options"):
         if click:
             button_press.play()
             return "close"
-
-
-
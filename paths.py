@@ -0,0 +1,178 @@
+import bisect
+import math
+import numpy as np
+
+
+class PathTable:
+    """
+    Arc-length parameterization of a waypoint path. Segment lengths, unit
+    directions and headings are computed once, so anything walking the path
+    only keeps a scalar "distance travelled" and looks its position and
+    heading up from here. Distances along the same path compare directly as
+    progress.
+    """
+
+    def __init__(self, points):
+        self.points = [tuple(map(float, point)) for point in points]
+        self.cumulative = [0.0]  # distance from the start to each waypoint
+        self.directions = []  # unit vector of each segment
+        self.headings = []  # degrees, same convention as math.atan2(-dy, dx)
+        for (x1, y1), (x2, y2) in zip(self.points, self.points[1:]):
+            dx, dy = x2 - x1, y2 - y1
+            length = math.hypot(dx, dy)
+            self.cumulative.append(self.cumulative[-1] + length)
+            if length:
+                self.directions.append((dx / length, dy / length))
+            else:
+                self.directions.append(self.directions[-1] if self.directions else (0.0, 0.0))
+            self.headings.append(math.degrees(math.atan2(-self.directions[-1][1], self.directions[-1][0])))
+        self.total = self.cumulative[-1]
+        self.segments = len(self.directions)
+
+        # NumPy copies for batched lookups
+        self.np_points = np.array(self.points[:-1], dtype=float)
+        self.np_cumulative = np.array(self.cumulative[:-1], dtype=float)
+        self.np_directions = np.array(self.directions, dtype=float)
+        self.np_headings = np.array(self.headings, dtype=float)
+        self._field = None
+
+    def segment_at(self, distance) -> int:
+        index = bisect.bisect_right(self.cumulative, distance) - 1
+        return min(max(index, 0), self.segments - 1)
+
+    def locate(self, distance):
+        """
+        Position and heading after walking distance along the path
+        :param distance: clamped to [0, total]
+        :return: ((x, y), heading in degrees)
+        """
+        distance = min(max(distance, 0.0), self.total)
+        index = self.segment_at(distance)
+        x, y = self.points[index]
+        dx, dy = self.directions[index]
+        along = distance - self.cumulative[index]
+        return (x + dx * along, y + dy * along), self.headings[index]
+
+    def locate_many(self, distances):
+        """
+        Batched locate for a NumPy array of distances
+        :return: (x array, y array, heading array)
+        """
+        distances = np.clip(distances, 0.0, self.total)
+        index = np.clip(np.searchsorted(self.np_cumulative, distances, side="right") - 1, 0, self.segments - 1)
+        along = distances - self.np_cumulative[index]
+        x = self.np_points[index, 0] + self.np_directions[index, 0] * along
+        y = self.np_points[index, 1] + self.np_directions[index, 1] * along
+        return x, y, self.np_headings[index]
+
+    def project(self, point):
+        """
+        Closest point of the path to point
+        :return: (distance along the path, (x, y) on the path)
+        """
+        distance, closest, _ = self.nearest(point)
+        return distance, closest
+
+    def nearest(self, point):
+        """
+        Closest point of the path to point, refined from the distance field
+        :return: (distance along the path, (x, y) on the path, distance from point to the path)
+        """
+        return self.distance_field().nearest(point)
+
+    def distance_field(self) -> "DistanceField":
+        if self._field is None:
+            self._field = DistanceField(self)
+        return self._field
+
+    def _nearest_on(self, point, segments):
+        """
+        Exact closest point over the given segment indices, the first one wins ties
+        :return: (distance along the path, (x, y) on the path, distance from point to the path)
+        """
+        px, py = point
+        best = None
+        for index in segments:
+            x, y = self.points[index]
+            dx, dy = self.directions[index]
+            length = self.cumulative[index + 1] - self.cumulative[index]
+            along = min(max((px - x) * dx + (py - y) * dy, 0.0), length)
+            cx, cy = x + dx * along, y + dy * along
+            gap = (cx - px) ** 2 + (cy - py) ** 2
+            if best is None or gap < best[0]:
+                best = (gap, self.cumulative[index] + along, (cx, cy))
+        return best[1], best[2], math.sqrt(best[0])
+
+
+FIELD_SIZE = (1280, 720)  # area covered by distance fields, points outside fall back to checking every segment
+
+
+class DistanceField:
+    """
+    Coarse grid over the map storing, for every cell, the distance from its
+    center to the path and the few segments that can be closest to any point
+    inside it. A query looks up its cell and projects onto those candidates
+    only, which gives the exact answer of checking every segment.
+    """
+
+    def __init__(self, table: PathTable, cell_size=8, size=FIELD_SIZE):
+        self.table = table
+        self.cell_size = cell_size
+        self.cols = math.ceil(size[0] / cell_size)
+        self.rows = math.ceil(size[1] / cell_size)
+
+        xs = (np.arange(self.cols) + 0.5) * cell_size
+        ys = (np.arange(self.rows) + 0.5) * cell_size
+        cx, cy = np.meshgrid(xs, ys)  # [row, col]
+        # distance from every cell center to every segment, shape [row, col, segment]
+        lengths = np.diff(np.array(table.cumulative))
+        rx = cx[..., None] - table.np_points[:, 0]
+        ry = cy[..., None] - table.np_points[:, 1]
+        along = np.clip(rx * table.np_directions[:, 0] + ry * table.np_directions[:, 1], 0.0, lengths)
+        gaps = np.hypot(rx - table.np_directions[:, 0] * along, ry - table.np_directions[:, 1] * along)
+        self.distance = gaps.min(axis=2)  # center of each cell to the path
+
+        # any point of a cell is within half a diagonal of its center, so a segment can only be
+        # closest somewhere in the cell if it is within a full diagonal of the nearest one
+        self.slack = cell_size * math.sqrt(2) / 2
+        candidates = gaps <= self.distance[..., None] + 2 * self.slack
+        width = int(candidates.sum(axis=2).max())
+        order = np.argsort(~candidates, axis=2, kind="stable")[..., :width]
+        self.candidates = np.where(np.take_along_axis(candidates, order, axis=2), order, -1)
+
+    def cell(self, point):
+        col, row = int(point[0] // self.cell_size), int(point[1] // self.cell_size)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row, col
+        return None
+
+    def nearest(self, point):
+        """
+        :return: (distance along the path, (x, y) on the path, distance from point to the path)
+        """
+        cell = self.cell(point)
+        if cell is None:
+            return self.table._nearest_on(point, range(self.table.segments))
+        return self.table._nearest_on(point, [index for index in self.candidates[cell].tolist() if index >= 0])
+
+    def within(self, point, radius) -> bool:
+        """True if point is no further than radius from the path."""
+        cell = self.cell(point)
+        if cell is not None:
+            # the cell's center distance bounds every point in the cell
+            if self.distance[cell] + self.slack <= radius:
+                return True
+            if self.distance[cell] - self.slack > radius:
+                return False
+        return self.nearest(point)[2] <= radius
+
+
+_tables = {}
+
+
+def get_path_table(path) -> PathTable:
+    """The shared table for a waypoint list, built on first use."""
+    key = tuple(path)
+    if key not in _tables:
+        _tables[key] = PathTable(path)
+    return _tables[key]
@@ -0,0 +1,117 @@
+import numpy as np
+import pygame
+
+PICK_RADIUS = 25  # half size of the square around a tower's position that selects it
+
+
+def opaque_pixels(image: pygame.Surface) -> np.ndarray:
+    """Bool array indexed [y, x], True where the image's alpha isn't 0."""
+    return pygame.surfarray.array_alpha(image).T != 0
+
+
+class PlacementMap:
+    """
+    Map-sized rasters for tower placement. blocked marks the illegal terrain
+    from the house hitbox image, footprints holds the id of the tower covering
+    each pixel and pick the id of the tower selected by clicking there. The
+    rasters are stamped when a tower is placed, stamped again when its sprite
+    changes and cleared when it is sold, so legality and picking are single
+    lookups however many towers there are.
+    """
+
+    def __init__(self, illegal_regions: pygame.Surface):
+        self.blocked = opaque_pixels(illegal_regions)
+        self.height, self.width = self.blocked.shape
+        self.footprints = np.zeros((self.height, self.width), dtype=np.int32)  # 0 is no tower
+        self.pick = np.zeros((self.height, self.width), dtype=np.int32)
+        self.towers = {}  # id -> tower
+        self.ids = {}  # tower -> id
+        self.areas = {}  # id -> rect covering what was stamped for it
+        self.next_id = 1
+
+    def _clip(self, rect: pygame.Rect):
+        """Map-space slices of rect and the matching slices into a rect-sized array."""
+        clipped = rect.clip(pygame.Rect(0, 0, self.width, self.height))
+        local = (slice(clipped.top - rect.top, clipped.bottom - rect.top),
+                 slice(clipped.left - rect.left, clipped.right - rect.left))
+        return (slice(clipped.top, clipped.bottom), slice(clipped.left, clipped.right)), local
+
+    def _footprint(self, tower):
+        image = tower.original_image
+        return image.get_rect(center=tower.position), opaque_pixels(image)
+
+    def _pick_rect(self, tower) -> pygame.Rect:
+        x, y = tower.position
+        return pygame.Rect(x - PICK_RADIUS, y - PICK_RADIUS, 2 * PICK_RADIUS + 1, 2 * PICK_RADIUS + 1)
+
+    def _stamp(self, tower, tower_id):
+        rect, opaque = self._footprint(tower)
+        self.areas[tower_id] = rect.union(self._pick_rect(tower))
+        region, local = self._clip(rect)
+        cells = self.footprints[region]
+        cells[opaque[local] & (cells == 0)] = tower_id
+        # overlapping pick squares go to the tower placed first, like the old list scan
+        region, _ = self._clip(self._pick_rect(tower))
+        cells = self.pick[region]
+        cells[cells == 0] = tower_id
+
+    def add(self, tower):
+        tower_id = self.next_id
+        self.next_id += 1
+        self.towers[tower_id] = tower
+        self.ids[tower] = tower_id
+        self._stamp(tower, tower_id)
+
+    def _unstamp(self, tower_id):
+        # the stamped area, not the current sprite, which an upgrade may have swapped
+        area = self.areas.pop(tower_id)
+        region, _ = self._clip(area)
+        self.footprints[region][self.footprints[region] == tower_id] = 0
+        self.pick[region][self.pick[region] == tower_id] = 0
+        # neighbours may have been hidden under the cleared tower
+        for other_id, other in sorted(self.towers.items()):
+            if other_id != tower_id and area.colliderect(self.areas[other_id]):
+                self._stamp(other, other_id)
+
+    def remove(self, tower):
+        tower_id = self.ids.pop(tower, None)
+        if tower_id is None:
+            return
+        del self.towers[tower_id]
+        self._unstamp(tower_id)
+
+    def restamp(self, tower):
+        """Stamps a placed tower again after its original_image changed, keeping its id."""
+        tower_id = self.ids.get(tower)
+        if tower_id is None:
+            return
+        self._unstamp(tower_id)
+        self._stamp(tower, tower_id)
+
+    def clear(self):
+        self.footprints[:] = 0
+        self.pick[:] = 0
+        self.towers.clear()
+        self.ids.clear()
+        self.areas.clear()
+
+    def is_legal(self, point) -> bool:
+        """True if a tower may be placed with its center on point."""
+        x, y = int(point[0]), int(point[1])
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return True
+        return not self.blocked[y, x] and not self.footprints[y, x]
+
+    def footprint_clear(self, image: pygame.Surface, center) -> bool:
+        """True if no opaque pixel of image centered on center covers illegal terrain or a tower."""
+        rect = image.get_rect(center=center)
+        region, local = self._clip(rect)
+        opaque = opaque_pixels(image)[local]
+        return not (opaque & (self.blocked[region] | (self.footprints[region] != 0))).any()
+
+    def tower_at(self, point):
+        """The tower selected by clicking point, or None."""
+        x, y = int(point[0]), int(point[1])
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        return self.towers.get(int(self.pick[y, x]))
@@ -0,0 +1,239 @@
+import json
+import threading
+import time
+from collections import deque
+import pygame
+import hud
+
+# section name -> color in the frame-time graph, stacked bottom to top in this order
+SECTIONS = {"input": (80, 160, 255),
+            "towers": (255, 170, 60),
+            "waves": (230, 70, 70),
+            "audio": (190, 90, 230),
+            "render": (80, 210, 110),
+            "flip": (240, 230, 90)}
+OTHER_COLOR = (110, 110, 110)  # frame time outside every section
+GRAPH_SIZE = (270, 60)  # one column per frame
+GRAPH_SCALE_MS = 1000 / 30  # frame time at the top of the graph
+TARGET_MS = 1000 / 60
+TRACE_PATH = "frame_trace.json"
+MAX_TRACE_EVENTS = 120000  # oldest events are dropped past this; about 10 per frame, so about 3 minutes at 60 fps
+NOTICE_SECONDS = 4  # how long a profiler message stays on the HUD
+
+
+class _NullSection:
+    """What section() hands out while profiling is off: entering and leaving it does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class FrameProfiler:
+    """
+    Scoped timers for the parts of a frame. The main loop wraps each part in
+    `with profiler.section(name):` between begin_frame() and end_frame().
+    Timing only runs while the graph is shown or a trace is being recorded;
+    otherwise section() hands back a shared no-op and the frame calls return
+    straight away. Recorded frames can be written as Chrome trace-event JSON,
+    which chrome://tracing and Perfetto open.
+    """
+
+    def __init__(self, history=GRAPH_SIZE[0]):
+        self.show_graph = False
+        self.tracing = False
+        self.history = deque(maxlen=history)  # per frame: (total ms, dict section -> ms)
+        self.events = deque(maxlen=MAX_TRACE_EVENTS)  # (name, start ns, duration ns)
+        self.notice = None  # (message, perf_counter time it goes away)
+        self._dump_path = None  # set when a stopped trace is waiting to be written
+        self._sections = {}
+        self._frame = None  # section -> ms of the frame being timed
+        self._frame_start = 0
+        self._origin = time.perf_counter_ns()
+        self._graph = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.show_graph or self.tracing
+
+    def section(self, name):
+        """Context manager timing the code inside it as part of section name."""
+        if self._frame is None:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame = {}
+            self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if self._dump_path is not None:
+            self._start_dump()
+        if self._frame is None:
+            return
+        end = time.perf_counter_ns()
+        total = (end - self._frame_start) / 1e6
+        self.history.append((total, self._frame))
+        if self.tracing:
+            self._trace("frame", self._frame_start, end)
+        if self.show_graph:
+            self._draw_column(total, self._frame)
+        self._frame = None
+
+    def _record(self, name, start, end):
+        if self._frame is None:
+            return
+        self._frame[name] = self._frame.get(name, 0.0) + (end - start) / 1e6
+        if self.tracing:
+            self._trace(name, start, end)
+
+    def _trace(self, name, start, end):
+        self.events.append((name, start, end - start))
+
+    def start_trace(self):
+        self.events.clear()
+        self.tracing = True
+
+    def stop_trace(self, path=TRACE_PATH):
+        """Stops recording. The trace is written on a worker thread once the current frame has ended."""
+        self.tracing = False
+        self._dump_path = path
+
+    def _start_dump(self):
+        path, self._dump_path = self._dump_path, None
+        events = list(self.events)
+        self.show_notice(f"Writing frame trace to {path}")
+        threading.Thread(target=self._dump_worker, args=(events, path), name="trace-dump", daemon=True).start()
+
+    def _dump_worker(self, events, path):
+        try:
+            self.dump_trace(path, events)
+        except OSError as error:
+            self.show_notice(f"Frame trace not written: {error}")
+        else:
+            self.show_notice(f"Frame trace written to {path}")
+
+    def dump_trace(self, path=TRACE_PATH, events=None) -> str:
+        """
+        Writes recorded sections as Chrome trace-event JSON
+        :param path: file to write
+        :param events: (name, start ns, duration ns) tuples, defaults to the recorded ones
+        :return: path
+        """
+        if events is None:
+            events = list(self.events)
+        origin = self._origin
+        trace_events = [{"name": "process_name", "ph": "M", "pid": 0, "args": {"name": "YummyTD"}}]
+        trace_events.extend({"name": name, "cat": "frame", "ph": "X", "pid": 0, "tid": 0,
+                             "ts": (start - origin) / 1000, "dur": duration / 1000}
+                            for name, start, duration in events)
+        with open(path, "w") as file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, file)
+        return path
+
+    def show_notice(self, message):
+        """Shows message on the HUD for NOTICE_SECONDS, see draw_notice."""
+        self.notice = (message, time.perf_counter() + NOTICE_SECONDS)
+
+    def toggle_graph(self):
+        self.show_graph = not self.show_graph
+        self._graph = None
+
+    def handle_key(self, event):
+        """KEYDOWN handler: F3 toggles the graph, F4 starts and stops a trace."""
+        if event.key == pygame.K_F3:
+            self.toggle_graph()
+        elif event.key == pygame.K_F4:
+            if self.tracing:
+                self.stop_trace()
+            else:
+                self.start_trace()
+                self.show_notice("Recording frame trace, F4 to stop")
+
+    def _draw_column(self, total, frame):
+        """Scrolls the graph one pixel left and draws the newest frame as a stacked column."""
+        width, height = GRAPH_SIZE
+        if self._graph is None:
+            self._graph = pygame.Surface(GRAPH_SIZE)
+            self._graph.fill((0, 0, 0))
+        self._graph.scroll(-1, 0)
+        self._graph.fill((0, 0, 0), (width - 1, 0, 1, height))
+        bottom = height
+        timed = 0.0
+        for name, color in SECTIONS.items():
+            ms = frame.get(name, 0.0)
+            timed += ms
+            bottom = self._bar(bottom, ms, color)
+        self._bar(bottom, total - timed, OTHER_COLOR)
+        target = height - int(TARGET_MS / GRAPH_SCALE_MS * height)
+        self._graph.set_at((width - 1, target), (255, 255, 255))
+
+    def _bar(self, bottom, ms, color) -> int:
+        size = int(round(ms / GRAPH_SCALE_MS * GRAPH_SIZE[1]))
+        top = max(bottom - size, 0)
+        if bottom > top:
+            self._graph.fill(color, (GRAPH_SIZE[0] - 1, top, 1, bottom - top))
+        return top
+
+    def draw_graph(self, scrn: pygame.Surface, pos):
+        """
+        Draws the frame-time graph with a legend under it
+        :param pos: top left (x, y)
+        :return: none
+        """
+        if self._graph is None:
+            return
+        scrn.blit(self._graph, pos)
+        x, y = pos[0], pos[1] + GRAPH_SIZE[1] + 2
+        for name, color in list(SECTIONS.items()) + [("other", OTHER_COLOR)]:
+            label = hud.text_cache.render(f"profile_{name}", name, "arial", 10, color)
+            scrn.blit(label, (x, y))
+            x += label.get_width() + 6
+        if self.history:
+            total = hud.text_cache.render("profile_total", f"{self.history[-1][0]:.1f} ms", "arial", 10,
+                                          (255, 255, 255))
+            scrn.blit(total, (pos[0] + GRAPH_SIZE[0] - total.get_width(), pos[1]))
+
+    def draw_notice(self, scrn: pygame.Surface, pos):
+        """
+        Draws the latest profiler message until it times out
+        :param pos: top left (x, y)
+        :return: none
+        """
+        notice = self.notice
+        if notice is None:
+            return
+        if time.perf_counter() > notice[1]:
+            self.notice = None
+            return
+        scrn.blit(hud.text_cache.render("profile_notice", notice[0], "arial", 12, (255, 255, 255)), pos)
+
+
+profiler = FrameProfiler()
@@ -0,0 +1,88 @@
+SLOT_BITS = 24
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class EntityRegistry:
+    """
+    Slot map holding the live enemies. Entities are kept densely packed for
+    iteration and removed by swapping the last one into the hole. Each entity
+    gets an entity_id packing its slot and the slot's generation; the
+    generation changes whenever the slot is freed, so an id kept after its
+    enemy was removed resolves to None instead of a dead object.
+    Entities also get a spawn_order that keeps counting up, for code that
+    needs the order enemies entered the map in.
+    Supports the list operations the game uses on its enemy list.
+    """
+
+    def __init__(self):
+        self.items = []  # dense
+        self.item_slots = []  # dense index -> slot
+        self.dense = []  # slot -> dense index
+        self.generations = []  # slot -> generation
+        self._free = []
+        self._spawned = 0
+
+    def add(self, entity) -> int:
+        """
+        Registers an entity
+        :return: int, its entity_id
+        """
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self.generations)
+            self.generations.append(0)
+            self.dense.append(-1)
+        self.dense[slot] = len(self.items)
+        self.items.append(entity)
+        self.item_slots.append(slot)
+        entity.entity_id = (self.generations[slot] << SLOT_BITS) | slot
+        entity.spawn_order = self._spawned
+        self._spawned += 1
+        return entity.entity_id
+
+    append = add
+
+    def get(self, entity_id):
+        """The entity for an id, or None once it has been removed."""
+        if entity_id is None:
+            return None
+        slot = entity_id & SLOT_MASK
+        if slot < len(self.generations) and self.generations[slot] == entity_id >> SLOT_BITS:
+            return self.items[self.dense[slot]]
+        return None
+
+    def remove(self, entity):
+        """Swap-removes an entity in O(1). Raises ValueError if it isn't registered."""
+        entity_id = getattr(entity, "entity_id", None)
+        if self.get(entity_id) is not entity:
+            raise ValueError("entity is not registered")
+        slot = entity_id & SLOT_MASK
+        index = self.dense[slot]
+        last = len(self.items) - 1
+        if index != last:
+            self.items[index] = self.items[last]
+            self.item_slots[index] = self.item_slots[last]
+            self.dense[self.item_slots[index]] = index
+        self.items.pop()
+        self.item_slots.pop()
+        self.dense[slot] = -1
+        self.generations[slot] += 1
+        self._free.append(slot)
+
+    def clear(self):
+        for slot in self.item_slots:
+            self.dense[slot] = -1
+            self.generations[slot] += 1
+            self._free.append(slot)
+        self.items.clear()
+        self.item_slots.clear()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
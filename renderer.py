@@ -0,0 +1,72 @@
+import pygame
+
+MAX_DIRTY_RECTS = 300  # past this many regions a full flip is cheaper than a rect list
+
+
+class DirtyRectScreen:
+    """
+    Stands in for the display surface during the map scene. Every blit is
+    recorded, so the next frame only restores those regions from the cached
+    background and only pushes them to the display with
+    pygame.display.update(rects). With full_frame=True it falls back to
+    redrawing the whole background and flipping, for comparison.
+    Anything it doesn't define is forwarded to the real display surface.
+    """
+
+    def __init__(self, surface: pygame.Surface, background: pygame.Surface, full_frame=False):
+        self.surface = surface
+        self.background = background
+        self.full_frame = full_frame
+        self.bounds = surface.get_rect()
+        self._frame_rects = []  # drawn this frame
+        self._stale_rects = []  # drawn last frame, restored at the start of this one
+        self._redraw_all = True  # the first frame paints and pushes the whole screen
+
+    def __getattr__(self, name):
+        return getattr(self.surface, name)
+
+    def blit(self, source, dest, area=None, special_flags=0) -> pygame.Rect:
+        rect = self.surface.blit(source, dest, area, special_flags)
+        self._frame_rects.append(rect)
+        return rect
+
+    def fill(self, color, rect=None, special_flags=0) -> pygame.Rect:
+        rect = self.surface.fill(color, rect, special_flags)
+        self._frame_rects.append(rect)
+        return rect
+
+    def mark(self, rect):
+        """Records a region drawn straight onto the display surface, e.g. by pygame.draw."""
+        self._frame_rects.append(pygame.Rect(rect))
+
+    def begin_frame(self):
+        """Wipes last frame's drawing by restoring the background underneath it."""
+        if self.full_frame or self._redraw_all:
+            self.surface.blit(self.background, (0, 0))
+        else:
+            for rect in self._stale_rects:
+                self.surface.blit(self.background, rect, rect)
+
+    def end_frame(self):
+        """Pushes the regions that changed (or the whole frame) to the display."""
+        if self.full_frame or self._redraw_all or len(self._stale_rects) + len(self._frame_rects) > MAX_DIRTY_RECTS:
+            pygame.display.flip()
+        else:
+            # both the regions wiped this frame and the ones drawn need to reach the display
+            dirty = [rect.clip(self.bounds) for rect in self._stale_rects + self._frame_rects]
+            pygame.display.update([rect for rect in dirty if rect.width and rect.height])
+        self._redraw_all = False
+        self._stale_rects = self._frame_rects
+        self._frame_rects = []
+
+
+def draw_circle(scrn, color, center, radius, width=0) -> pygame.Rect:
+    """
+    pygame.draw.circle that also records the region on a DirtyRectScreen
+    :return: pygame.Rect
+    """
+    if isinstance(scrn, DirtyRectScreen):
+        rect = pygame.draw.circle(scrn.surface, color, center, radius, width)
+        scrn.mark(rect)
+        return rect
+    return pygame.draw.circle(scrn, color, center, radius, width)
@@ -0,0 +1,171 @@
+"""
+Headless, fixed-timestep simulation of YummyTD.
+
+Waves, towers and enemies are advanced by an injected clock one fixed tick at a
+time with no display surface, so a full game can run in seconds for balancing
+and regression runs:
+
+    python simulation.py
+"""
+import contextlib
+import io
+import time
+import game_tools
+import waves
+
+TICK_MS = 1000 / 60  # one frame of the real game loop at clock.tick(60)
+LAST_ROUND = 17
+
+# (tower type, position) pairs on legal spots of the house map
+DEFAULT_LAYOUT = [("mrcheese", (260, 220)),
+                  ("mrcheese", (580, 220)),
+                  ("mrcheese", (740, 200)),
+                  ("mrcheese", (840, 420)),
+                  ("mrcheese", (140, 460)),
+                  ("mrcheese", (460, 120)),
+                  ("mrcheese", (640, 260)),
+                  ("mrcheese", (760, 560)),
+                  ("mrcheese", (960, 440)),
+                  ("rattent", (320, 180)),
+                  ("ozbourne", (620, 220)),
+                  ("ozbourne", (800, 560))]
+
+
+class SimClock:
+    """Millisecond clock that only moves when the simulation advances it."""
+
+    def __init__(self, start=0):
+        self.time = start
+
+    def advance(self, ms):
+        self.time += ms
+
+    def __call__(self) -> int:
+        return int(self.time)
+
+
+class Simulation:
+    def __init__(self, round_number=1, tick_ms=TICK_MS, money=None, health=None, quiet=True):
+        """
+        Resets the shared game state and takes over the gameplay clock
+        :param round_number: first round to play
+        :param tick_ms: fixed simulation step in milliseconds
+        :param money: starting money, defaults to the game's current value
+        :param health: starting health, defaults to the game's current value
+        :param quiet: swallow the debug prints of the wave code
+        """
+        game_tools.init(display=False, audio=False)
+        self.clock = SimClock()
+        self.tick_ms = tick_ms
+        self.round_number = round_number
+        self.ticks = 0
+        self.quiet = quiet
+        self.phase_seconds = {"towers": 0.0, "waves": 0.0, "audio": 0.0}  # wall time spent in each part of step()
+        game_tools.set_clock(self.clock)
+        for tower in game_tools.towers[:]:
+            game_tools.remove_tower(tower)
+        game_tools.clear_enemies()
+        game_tools.target_claims.clear()
+        game_tools.RoundFlag = False
+        if money is not None:
+            game_tools.money = money
+        if health is not None:
+            game_tools.user_health = health
+
+    def place_tower(self, tower: str, position: tuple, pay=True):
+        """
+        Places a tower the same way the in-game menu does
+        :param tower: "mrcheese", "rattent" or "ozbourne"
+        :param position: (x, y) center of the tower
+        :param pay: deduct the tower cost from the player's money
+        :return: Tower
+        """
+        placed = game_tools.create_tower(tower, position)
+        game_tools.add_tower(placed)
+        if pay:
+            game_tools.money -= placed.cost
+        return placed
+
+    def step(self) -> bool:
+        """
+        Advances the game by one fixed tick
+        :return: bool, True once the current wave is finished
+        """
+        self.clock.advance(self.tick_ms)
+        self.ticks += 1
+        start = time.perf_counter()
+        game_tools.update_towers(None)
+        after_towers = time.perf_counter()
+        complete = waves.send_wave(None, self.round_number)
+        after_waves = time.perf_counter()
+        game_tools.sfx.flush()
+        self.phase_seconds["towers"] += after_towers - start
+        self.phase_seconds["waves"] += after_waves - after_towers
+        self.phase_seconds["audio"] += time.perf_counter() - after_waves
+        return complete
+
+    def run_wave(self, max_ticks=200000) -> dict:
+        """
+        Plays the current round until it is cleared, the player dies or max_ticks pass
+        :return: dict with the wave outcome
+        """
+        start_ticks = self.ticks
+        with self._output():
+            waves.start_new_wave(self.round_number)
+            game_tools.RoundFlag = True
+            complete = False
+            while not complete and game_tools.user_health > 0 and self.ticks - start_ticks < max_ticks:
+                complete = self.step()
+            # one idle frame so towers drop their recruits and riffs like between rounds
+            game_tools.RoundFlag = False
+            game_tools.update_towers(None)
+        result = {"round": self.round_number,
+                  "complete": complete,
+                  "ticks": self.ticks - start_ticks,
+                  "health": game_tools.user_health,
+                  "money": game_tools.money,
+                  "spawned": waves.enemies_spawned}
+        if complete:
+            self.round_number += 1
+        return result
+
+    def run_game(self, last_round=LAST_ROUND) -> list:
+        """
+        Plays every round up to last_round, stopping early if a wave is lost
+        :return: list of wave results
+        """
+        results = []
+        while self.round_number <= last_round:
+            result = self.run_wave()
+            results.append(result)
+            if not result["complete"]:
+                break
+        return results
+
+    def close(self):
+        """Hands the gameplay clock back to pygame."""
+        game_tools.set_clock(None)
+
+    def _output(self):
+        return contextlib.redirect_stdout(io.StringIO()) if self.quiet else contextlib.nullcontext()
+
+
+def main():
+    sim = Simulation(round_number=1, money=25000, health=100)
+    for tower, position in DEFAULT_LAYOUT:
+        sim.place_tower(tower, position)
+    start = time.perf_counter()
+    results = sim.run_game()
+    elapsed = time.perf_counter() - start
+    sim.close()
+    for result in results:
+        print(f"Round {result['round']:>2}: {'cleared' if result['complete'] else 'LOST':7} "
+              f"{result['ticks']:>6} ticks  health {result['health']:>4}  money {result['money']}")
+    total_ticks = sum(result["ticks"] for result in results)
+    print(f"{total_ticks} ticks ({total_ticks * TICK_MS / 1000:.0f}s of game time) in {elapsed:.2f}s")
+    print(f"Projectile pool: {game_tools.projectile_pool.stats()}")
+    print(f"Sound effects: {game_tools.sfx.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import math
+
+
+class SpatialHash:
+    """
+    Uniform grid over the map used to find enemies near a point without
+    scanning every enemy. The grid is rebuilt once per frame from the enemy
+    list; positions outside the map are clamped into the border cells.
+    """
+
+    def __init__(self, width=1280, height=720, cell_size=64):
+        self.cell_size = cell_size
+        self.cols = math.ceil(width / cell_size)
+        self.rows = math.ceil(height / cell_size)
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        self.used = []  # indices of non-empty cells, so clearing doesn't touch the whole grid
+        self.count = 0
+        self.first_order = None  # spawn_order of the oldest indexed enemy
+
+    def _cell_coords(self, x, y):
+        col = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return col, row
+
+    def clear(self):
+        for index in self.used:
+            self.cells[index].clear()
+        self.used.clear()
+        self.count = 0
+        self.first_order = None
+
+    def rebuild(self, enemies):
+        """Re-indexes every enemy at its current position, ordered by spawn_order."""
+        self.clear()
+        size, cols, rows, cells, used = self.cell_size, self.cols, self.rows, self.cells, self.used
+        first_order = None
+        for enemy in enemies:
+            order = enemy.spawn_order
+            if first_order is None or order < first_order:
+                first_order = order
+            x, y = enemy.position
+            col = min(max(int(x // size), 0), cols - 1)
+            row = min(max(int(y // size), 0), rows - 1)
+            cell = cells[row * cols + col]
+            if not cell:
+                used.append(row * cols + col)
+            cell.append((order, x, y, enemy))
+        self.count = len(enemies)
+        self.first_order = first_order
+
+    def query(self, point, radius) -> list:
+        """
+        Finds the enemies within radius of point
+        :param point: (x, y) center of the search
+        :param radius: search radius in pixels, inclusive
+        :return: list of (order, distance, enemy) sorted by spawn order
+        """
+        px, py = point
+        radius_sq = radius * radius
+        min_col, min_row = self._cell_coords(px - radius, py - radius)
+        max_col, max_row = self._cell_coords(px + radius, py + radius)
+        found = []
+        for row in range(min_row, max_row + 1):
+            base = row * self.cols
+            for col in range(min_col, max_col + 1):
+                for order, x, y, enemy in self.cells[base + col]:
+                    dx = x - px
+                    dy = y - py
+                    distance_sq = dx * dx + dy * dy
+                    if distance_sq <= radius_sq:
+                        found.append((order, math.sqrt(distance_sq), enemy))
+        found.sort(key=lambda entry: entry[0])
+        return found
+
+    def enemies_within(self, point, radius) -> list:
+        """
+        Enemies within radius of point, in spawn order
+        :return: list
+        """
+        return [enemy for _, _, enemy in self.query(point, radius)]
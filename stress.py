@@ -0,0 +1,151 @@
+"""
+Stress scenarios for the headless simulation.
+
+Sends one synthetic wave of N enemies of mixed types against M towers of every
+type laid out on legal spots of the house map, and reports how fast the game
+ticks, where the time goes and how many entities were alive at once:
+
+    python stress.py 1000 5
+    python stress.py 10000 10 --max-ticks 5000
+
+send_wave spawns at most one enemy per tick, so a wave of N enemies needs at
+least N ticks to be fully out.
+"""
+import argparse
+import random
+import time
+import game_tools
+import towers as tower_types
+import waves
+from simulation import Simulation, TICK_MS
+
+STRESS_ROUND = 1000  # round number the synthetic wave is played as, past the real ones
+STRESS_HEALTH = 10 ** 9  # escaped enemies shouldn't end the run
+TOWER_TYPES = ("mrcheese", "rattent", "ozbourne")
+DEFAULT_MIX = {"ANT": 6, "HORNET": 3, "CENTIPEDE": 1}  # enemy type -> share of the wave
+SPOT_STEP = 25  # pixels between candidate tower spots
+RATTENT_RADIUS = 50  # RatTent's default radius
+
+
+def synthetic_wave(enemy_count: int, mix=None, interval=TICK_MS, round_number=STRESS_ROUND) -> waves.Wave:
+    """
+    Compiles a wave of enemy_count enemies, the types interleaved by their share in mix
+    :param mix: dict enemy type -> weight, defaults to DEFAULT_MIX
+    :param interval: milliseconds between spawns
+    :return: waves.Wave
+    """
+    group = [[enemy_type, weight] for enemy_type, weight in (mix or DEFAULT_MIX).items() if weight]
+    per_group = sum(weight for _, weight in group)
+    spec = {"waves": {str(round_number): {"interval": interval, "size": enemy_count,
+                                          "runs": [{"repeat": -(-enemy_count // per_group), "runs": group}]}}}
+    return waves.compile_spec(spec)[round_number]
+
+
+def layout_towers(per_type: int, seed=0, step=SPOT_STEP) -> dict:
+    """
+    Places per_type towers of every type on legal, non-overlapping spots,
+    RatTents only where they can reach the recruit path. The spots are visited
+    in a seeded random order so the towers spread over the map.
+    :return: dict tower type -> number placed, less than per_type if the map ran out of room
+    """
+    placement = game_tools.get_placement_map()
+    spots = [(x, y) for y in range(step // 2, placement.height, step)
+             for x in range(step // 2, placement.width, step)]
+    random.Random(seed).shuffle(spots)
+    placed = {tower: 0 for tower in TOWER_TYPES}
+    for spot in spots:
+        pending = [tower for tower in TOWER_TYPES if placed[tower] < per_type]
+        if not pending:
+            break
+        if not placement.is_legal(spot):
+            continue
+        # a RatTent only sends recruits when the recruit path passes within its radius
+        fits = [tower for tower in pending if tower != "rattent"
+                or game_tools.within_spawn_point(spot, game_tools.recruit_path, RATTENT_RADIUS)]
+        if not fits:
+            continue
+        tower = min(fits, key=lambda name: placed[name])
+        candidate = game_tools.create_tower(tower, spot)
+        if placement.footprint_clear(candidate.original_image, spot):
+            game_tools.add_tower(candidate)
+            placed[tower] += 1
+    return placed
+
+
+def count_entities() -> int:
+    """Enemies plus every projectile, recruit and riff the towers have in flight."""
+    return len(game_tools.enemies) + sum(len(tower.projectiles) for tower in game_tools.towers)
+
+
+def run_stress(enemy_count: int, towers_per_type: int, mix=None, interval=TICK_MS, max_ticks=None, seed=0) -> dict:
+    """
+    Plays one synthetic wave headless
+    :param enemy_count: enemies in the wave
+    :param towers_per_type: towers of each type to place
+    :param max_ticks: stop after this many ticks, None to play until the wave is over
+    :return: dict with the run's numbers
+    """
+    sim = Simulation(round_number=STRESS_ROUND, money=0, health=STRESS_HEALTH)
+    placed = layout_towers(towers_per_type, seed)
+    waves.WAVES[STRESS_ROUND] = synthetic_wave(enemy_count, mix, interval)
+    tents = [tower for tower in game_tools.towers if isinstance(tower, tower_types.RatTent)]
+    recruit_seconds = 0.0
+    peak_entities = peak_enemies = peak_recruits = 0
+    complete = False
+    try:
+        with sim._output():
+            waves.start_new_wave(STRESS_ROUND)
+            game_tools.RoundFlag = True
+            start = time.perf_counter()
+            while not complete and (max_ticks is None or sim.ticks < max_ticks):
+                complete = sim.step()
+                # update_towers leaves RatTents alone, so their recruits are spawned, moved and collided here
+                before = time.perf_counter()
+                for tent in tents:
+                    tent.shoot(game_tools.enemies)
+                recruit_seconds += time.perf_counter() - before
+                peak_enemies = max(peak_enemies, len(game_tools.enemies))
+                peak_recruits = max(peak_recruits, sum(len(tent.projectiles) for tent in tents))
+                peak_entities = max(peak_entities, count_entities())
+            elapsed = time.perf_counter() - start
+            game_tools.RoundFlag = False
+    finally:
+        del waves.WAVES[STRESS_ROUND]
+        sim.close()
+    phases = dict(sim.phase_seconds, recruits=recruit_seconds)
+    return {"enemies": enemy_count,
+            "towers": placed,
+            "complete": complete,
+            "ticks": sim.ticks,
+            "seconds": elapsed,
+            "ticks_per_second": sim.ticks / elapsed if elapsed else 0.0,
+            "phase_ms_per_tick": {phase: 1000 * total / max(sim.ticks, 1) for phase, total in phases.items()},
+            "spawned": waves.enemies_spawned,
+            "peak_enemies": peak_enemies,
+            "peak_recruits": peak_recruits,
+            "peak_entities": peak_entities,
+            "health_lost": STRESS_HEALTH - game_tools.user_health}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless stress run of one synthetic wave.")
+    parser.add_argument("enemies", type=int, help="enemies in the wave")
+    parser.add_argument("towers", type=int, help="towers of each type")
+    parser.add_argument("--interval", type=float, default=TICK_MS,
+                        help="milliseconds between spawns, at most one spawn per tick")
+    parser.add_argument("--max-ticks", type=int, default=None, help="stop after this many ticks")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the tower layout")
+    args = parser.parse_args()
+    result = run_stress(args.enemies, args.towers, interval=args.interval, max_ticks=args.max_ticks, seed=args.seed)
+    print(f"{result['enemies']} enemies vs towers {result['towers']}: "
+          f"{'cleared' if result['complete'] else 'stopped'} after {result['ticks']} ticks")
+    print(f"{result['ticks_per_second']:.0f} ticks/s ({result['ticks_per_second'] * TICK_MS / 1000:.1f}x real time) "
+          f"in {result['seconds']:.2f}s")
+    print("ms per tick: " + "  ".join(f"{phase} {ms:.3f}" for phase, ms in result["phase_ms_per_tick"].items()))
+    print(f"Peak: {result['peak_enemies']} enemies, {result['peak_recruits']} recruits, "
+          f"{result['peak_entities']} entities; "
+          f"spawned {result['spawned']}, health lost {result['health_lost']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+class TargetClaims:
+    """
+    Table of which towers are currently targeting each enemy. Towers release
+    their old target and claim the new one every time they retarget, so
+    "is this enemy already someone's target" is a dictionary lookup instead of
+    a scan over every tower.
+    """
+
+    def __init__(self):
+        self._claims = {}  # enemy -> {tower: None}, kept in claim order
+
+    def claim(self, tower, enemy):
+        if enemy is None:
+            return
+        self._claims.setdefault(enemy, {})[tower] = None
+
+    def release(self, tower, enemy):
+        if enemy is None:
+            return
+        claimants = self._claims.get(enemy)
+        if claimants is not None:
+            claimants.pop(tower, None)
+            if not claimants:
+                del self._claims[enemy]
+
+    def is_claimed(self, enemy) -> bool:
+        return enemy in self._claims
+
+    def clear(self):
+        self._claims.clear()
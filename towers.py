@@ -1,6 +1,8 @@
 import math
 import game_tools
-import pygame
+import paths
+from renderer import draw_circle
+from collisions import collide_recruits
 
 
 class Tower:
@@ -27,49 +29,48 @@ class Tower:
         self.sell_amt = int(cost / 2)
 
     def update(self, enemies):
+        game_tools.target_claims.release(self, self.target)
         self.target = None
-        potential_targets = []
         # Gather all enemies within range
-        for enemy in enemies:
-            distance = math.sqrt((enemy.position[0] - self.position[0]) ** 2 +
-                                 (enemy.position[1] - self.position[1]) ** 2)
-            if distance <= self.radius:
-                potential_targets.append((distance, enemy))
+        potential_targets = [(distance, enemy) for _, distance, enemy
+                             in game_tools.enemy_grid.query(self.position, self.radius)]
 
         # Sort enemies by distance
         potential_targets.sort(key=lambda x: x[0])
 
         # Assign an enemy that is not already targeted by another tower
         for _, enemy in potential_targets:
-            if not any(tower.target == enemy for tower in game_tools.towers if tower != self
-            and not isinstance(tower, game_tools.RatTent)):
+            if not game_tools.target_claims.is_claimed(enemy):
                 self.target = enemy
                 break  # Stop once a unique target is found
 
         # If all enemies are already targeted, pick the closest one
         if self.target is None and potential_targets:
             self.target = potential_targets[0][1]
+        game_tools.target_claims.claim(self, self.target)
 
         # Rotate towards the target if one is found
         if self.target:
             dx = self.target.position[0] - self.position[0]
             dy = self.target.position[1] - self.position[1]
             self.angle = math.degrees(math.atan2(-dy, dx))  # Negative for correct orientation
-            self.image = pygame.transform.rotate(self.original_image, self.angle)
+            self.image = game_tools.get_rotated(self.original_image, self.angle)
             self.rect = self.image.get_rect(center=self.position)
 
-        # Update all projectiles
-        for projectile in self.projectiles[:]:
+        # Update all projectiles, back to front so finished ones can be swap-removed in place
+        for index in range(len(self.projectiles) - 1, -1, -1):
+            projectile = self.projectiles[index]
             projectile.move()
             if projectile.hit:  # Check if the projectile has hit the target
-                if self.target is not None and self.target.is_alive:  # Apply damage if the target is still alive
-                    self.target.take_damage(self.damage)
+                target = game_tools.enemies.get(projectile.target)
+                if target is not None and target.is_alive:  # Apply damage if its target is still alive
+                    target.take_damage(self.damage)
                 if not self.penetration:
-                    self.projectiles.remove(projectile)
+                    game_tools.projectile_pool.release(game_tools.swap_remove(self.projectiles, index))
                 if self.penetration:
                     projectile.penetration -= 1
                     if projectile.penetration == 0:
-                        self.projectiles.remove(projectile)
+                        game_tools.projectile_pool.release(game_tools.swap_remove(self.projectiles, index))
 
     def render(self, screen):
         # Draw the tower
@@ -83,9 +84,9 @@ class Tower:
 
     def shoot(self, *args):
         # Shoot a projectile if enough time has passed since the last shot
-        current_time = pygame.time.get_ticks()
+        current_time = game_tools.get_ticks()
         if self.target and current_time - self.last_shot_time >= self.shoot_interval:
-            projectile = game_tools.Projectile(
+            projectile = game_tools.projectile_pool.acquire(
                 position=self.position,
                 target=self.target,
                 speed=self.speed,  # Speed of the projectile
@@ -123,13 +124,9 @@ class RatTent(Tower):
         pass
 
     def shoot(self, enemies):
-        current_time = pygame.time.get_ticks()
+        current_time = game_tools.get_ticks()
         if current_time - self.last_shot_time >= self.shoot_interval and game_tools.RoundFlag:
-            recruit_entity = game_tools.RecruitEntity(self.position, 1, 1,
-                                                      game_tools.recruit_path, 1, self.projectile_image)
-            closest_spawn_point, _ = recruit_entity.get_closest_point_on_path(self.position)
-            distance = ((closest_spawn_point[0] - self.position[0]) ** 2 +
-                        (closest_spawn_point[1] - self.position[1]) ** 2) ** 0.5
+            _, closest_spawn_point, distance = paths.get_path_table(game_tools.recruit_path).nearest(self.position)
             if distance <= self.radius:
                 recruit = game_tools.RecruitEntity(
                     position=closest_spawn_point,
@@ -142,12 +139,13 @@ class RatTent(Tower):
                 self.projectiles.append(recruit)
                 self.last_shot_time = current_time
 
-        for recruit in self.projectiles[:]:
-            recruit.update(enemies)
-            if not recruit.is_alive:
-                self.projectiles.remove(recruit)
-            if not game_tools.RoundFlag:
-                self.projectiles.remove(recruit)
+        for recruit in self.projectiles:
+            recruit.move()
+        collide_recruits(self.projectiles, enemies, paths.get_path_table(game_tools.house_path))
+        if not game_tools.RoundFlag:
+            self.projectiles.clear()
+        else:
+            self.projectiles = [recruit for recruit in self.projectiles if recruit.is_alive]
 
 
 class Ozbourne(Tower):
@@ -169,27 +167,25 @@ class Ozbourne(Tower):
         self.riff_sfx = game_tools.load_sound("assets/riff1.mp3")
 
     def update(self, enemies):
-        current_time = pygame.time.get_ticks()
+        current_time = game_tools.get_ticks()
 
         # Check if enough time has passed to trigger a blast
         if current_time - self.last_blast_time >= self.riff_interval:
             # Check if any enemies are in range
-            for enemy in enemies:
-                distance = math.sqrt((enemy.position[0] - self.position[0]) ** 2 +
-                                     (enemy.position[1] - self.position[1]) ** 2)
-                if distance <= self.radius:
-                    self.shoot(enemies)
-                    break  # Stop checking once a blast is triggered
-                else:
-                    self.riff_count = 0
-                    self.riff_sfx.stop()
-                    self.damage = 1
+            in_range = game_tools.enemy_grid.query(self.position, self.radius)
+            # Out-of-range enemies spawned before the first one in range break the riff streak
+            if game_tools.enemy_grid.count and (not in_range or in_range[0][0] != game_tools.enemy_grid.first_order):
+                self.riff_count = 0
+                self.riff_sfx.stop()
+                self.damage = 1
+            if in_range:
+                self.shoot(enemies)
 
         # Handle blast animation timing
         if self.blast_active:
-            self.blast_animation_timer += pygame.time.get_ticks() - self.last_blast_time
+            self.blast_animation_timer += game_tools.get_ticks() - self.last_blast_time
             self.blast_radius += (self.max_blast_radius / self.blast_duration) * (
-                        pygame.time.get_ticks() - self.last_blast_time)
+                        game_tools.get_ticks() - self.last_blast_time)
 
             if self.blast_animation_timer >= self.blast_duration:
                 self.blast_active = False
@@ -203,26 +199,23 @@ class Ozbourne(Tower):
     def shoot(self, enemies):
         """Triggers an AoE attack damaging enemies in range."""
         if self.curr_bottom_upgrade < 1:
-            self.riff_sfx.play()
+            game_tools.sfx.play(self.riff_sfx)
         elif self.curr_bottom_upgrade >= 1:
             self.riff_count += 1
             if self.riff_count == 1:
-                self.riff_sfx.play()
+                game_tools.sfx.play(self.riff_sfx)
             elif self.riff_count >= 88:
                 self.riff_count = 0
             self.damage += (self.riff_count * .1)
 
-        self.last_blast_time = pygame.time.get_ticks()
+        self.last_blast_time = game_tools.get_ticks()
         self.blast_active = True
         self.blast_animation_timer = 0
         self.blast_radius = 0  # Reset the expanding effect
 
         # Apply damage to enemies within blast radius
-        for enemy in enemies:
-            distance = math.sqrt((enemy.position[0] - self.position[0]) ** 2 +
-                                 (enemy.position[1] - self.position[1]) ** 2)
-            if distance <= self.riff_blast_radius:
-                enemy.take_damage(self.damage)
+        for enemy in game_tools.enemy_grid.enemies_within(self.position, self.riff_blast_radius):
+            enemy.take_damage(self.damage)
 
     def render(self, screen):
         # Draw the tower
@@ -240,7 +233,7 @@ class Ozbourne(Tower):
             g = int(200 * (1 - normalized_damage))  # Decreases with damage
             b = int(100 * (1 - normalized_damage))  # Decreases with damage
 
-            pygame.draw.circle(
+            draw_circle(
                 screen,
                 (r, g, b),  # RGB without alpha (pygame doesn't support alpha in draw functions)
                 self.position,
@@ -1,140 +1,270 @@
+import json
 import math
+import os
 import pygame
 import game_tools
-from enemies import AntEnemy, HornetEnemy, CentipedeEnemy, CentipedeBoss
+import enemy_store
+from enemies import SPAWN_POINT, Enemy, AntEnemy, HornetEnemy, CentipedeEnemy, CentipedeBoss, CentipedeChain
 
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "waves.json")
+BOSS_TAIL_SPEED = 0.5  # the whole boss slows down once its tail is out
 
 # initializes used variables
-enemy_data = [AntEnemy, HornetEnemy]
-wave_size = 0
-spawn_interval = 0
+wave_size = 0  # None for a wave without an end
+spawn_interval = 0  # wait before the next spawn
+next_enemy = None  # type of the next spawn, None once the wave has sent everything
+wave_events = None  # generator of the current wave's spawn events
 last_spawn_time = 0
-current_wave = 1
 enemies_spawned = 0
 enemies = game_tools.enemies
-trigger_rush = -1
-rush_num = -1
-rush_speed = -1
-
-# initializes enemies used in the waves
-waves = []
-wave_1 = ["ANT"] * 10  # Re-optimized using multiplication for list creation
-for i in range(1, 5):
-    wave_1 += ["ANT"] * (10 - i)
-    wave_1 += ["HORNET"] * i
-for i in range(10):
-    waves.append(wave_1)
-wave_11 = ["ANT"] * 10
-for i in range(7, 10):
-    wave_11 += ["ANT"] * (10 - i)
-    wave_11 += ["HORNET"] * i
-wave_11 += ["HORNET"] * 10
-waves.append(wave_11)
-wave_12 = []
-wave_12 += ["ANT", "HORNET"]
-waves.append(wave_12)
-wave_13 = []
-for i in range(10):
-    wave_13 += ["ANT", "HORNET", "HORNET", "HORNET", "HORNET"]
-waves.append(wave_13)
-wave_14 = []  # Unused in the current wave sequence; kept as in original
-for i in range(35):
-    wave_14 += ["HORNET"]
-waves.append(wave_14)
-wave_15 = []
-wave_15 += ["ANT"] * 15
-wave_15 += ["HORNET"] * 15
-for i in range(15):
-    wave_15 += ["ANT", "HORNET"]
-waves.append(wave_15)
-wave_16 = []
-wave_16 += ["CENTIPEDE"] * 3
-waves.append(wave_16)
-wave_17 = ["CENTIPEDEBOSS"] * 100
-waves.append(wave_17)
+boss_chain = None  # CentipedeChain of the boss being spawned
+
+
+def spawn_ant(index: int):
+    enemies.append(AntEnemy(SPAWN_POINT))
+
+
+def spawn_hornet(index: int):
+    enemies.append(HornetEnemy(SPAWN_POINT))
+
+
+def spawn_centipede(index: int):
+    enemies.append(CentipedeEnemy(SPAWN_POINT, game_tools.house_path))
+
+
+def spawn_boss_head(index: int):
+    global boss_chain
+    boss_chain = CentipedeChain()
+    enemies.append(CentipedeBoss(index, SPAWN_POINT, image_path="assets/centipede_head.png", chain=boss_chain))
+
+
+def spawn_boss_link(index: int):
+    enemies.append(CentipedeBoss(index, SPAWN_POINT, image_path="assets/centipede_link.png", chain=boss_chain))
+
+
+def spawn_boss_tail(index: int):
+    enemies.append(CentipedeBoss(index, SPAWN_POINT, image_path="assets/centipede_tail.png", chain=boss_chain))
+    boss_chain.set_speed(BOSS_TAIL_SPEED)
+
+
+# enemy type in the spec -> function spawning it, given its index in the wave
+SPAWNERS = {
+    "ANT": spawn_ant,
+    "HORNET": spawn_hornet,
+    "CENTIPEDE": spawn_centipede,
+    "BOSS_HEAD": spawn_boss_head,
+    "BOSS_LINK": spawn_boss_link,
+    "BOSS_TAIL": spawn_boss_tail,
+}
+
+
+class WaveSpecError(ValueError):
+    """Raised when the wave spec file describes an invalid wave."""
+
+
+class Wave:
+    """
+    A compiled wave: runs of enemy types plus its timing. events() expands the
+    runs lazily, so a wave costs the same memory however many enemies it sends.
+    """
+
+    def __init__(self, round_number, interval, size, runs, rush_start=None, rush_count=None, rush_interval=None):
+        """
+        :param interval: milliseconds between spawns
+        :param size: most enemies the wave sends, None for no cap
+        :param runs: validated runs, (enemy type, count or None, interval or None) or ("repeat", n, runs)
+        :param rush_start: index of the first spawn using rush_interval, None for no rush
+        :param rush_count: spawns the rush lasts, None for the rest of the wave
+        """
+        self.round_number = round_number
+        self.interval = interval
+        self.runs = runs
+        total = _runs_length(runs)
+        # a wave can't send more enemies than its runs hold
+        self.size = total if size is None else (size if total is None else min(size, total))
+        self.rush_start = rush_start
+        self.rush_count = rush_count
+        self.rush_interval = rush_interval
+
+    def _in_rush(self, index: int) -> bool:
+        if self.rush_start is None or index < self.rush_start:
+            return False
+        return self.rush_count is None or index < self.rush_start + self.rush_count
+
+    def events(self):
+        """
+        Yields the wave's spawn events in order
+        :return: generator of (milliseconds to wait after the previous spawn, enemy type)
+        """
+        for index, (enemy_type, interval) in enumerate(_expand(self.runs)):
+            if self.size is not None and index >= self.size:
+                return
+            if self._in_rush(index):
+                interval = self.rush_interval
+            yield (self.interval if interval is None else interval), enemy_type
+
+
+def _expand(runs):
+    """Yields (enemy type, interval or None) for every spawn in runs."""
+    for run in runs:
+        if run[0] == "repeat":
+            for _ in range(run[1]):
+                yield from _expand(run[2])
+        elif run[1] is None:
+            while True:
+                yield run[0], run[2]
+        else:
+            for _ in range(run[1]):
+                yield run[0], run[2]
+
+
+def _runs_length(runs):
+    """Spawns in runs, or None if they never end."""
+    total = 0
+    for run in runs:
+        if run[0] == "repeat":
+            length = _runs_length(run[2])
+            length = None if length is None else length * run[1]
+        else:
+            length = run[1]
+        if length is None:
+            return None
+        total += length
+    return total
+
+
+def _check_count(value, what, allow_none=False):
+    if value is None and allow_none:
+        return value
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise WaveSpecError(f"{what} must be a non-negative integer, got {value!r}")
+    return value
+
+
+def _check_interval(value, what):
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+        raise WaveSpecError(f"{what} must be a non-negative number of milliseconds, got {value!r}")
+    return value
+
+
+def _compile_runs(runs, where):
+    if not isinstance(runs, list):
+        raise WaveSpecError(f"{where}: runs must be a list")
+    compiled = []
+    for position, run in enumerate(runs):
+        what = f"{where} run {position}"
+        if isinstance(run, dict):
+            repeat = _check_count(run.get("repeat"), f"{what} repeat")
+            inner = _compile_runs(run.get("runs"), what)
+            if _runs_length(inner) is None:
+                raise WaveSpecError(f"{what}: an endless run can't be repeated")
+            compiled.append(("repeat", repeat, inner))
+            continue
+        if not isinstance(run, list) or len(run) not in (2, 3):
+            raise WaveSpecError(f"{what}: expected [enemy type, count] or [enemy type, count, interval]")
+        if run[0] not in SPAWNERS:
+            raise WaveSpecError(f"{what}: unknown enemy type {run[0]!r}")
+        count = _check_count(run[1], f"{what} count", allow_none=True)
+        interval = _check_interval(run[2], f"{what} interval") if len(run) == 3 else None
+        compiled.append((run[0], count, interval))
+    return compiled
+
+
+def compile_spec(spec: dict) -> dict:
+    """
+    Validates a wave spec and compiles it
+    :param spec: the parsed spec file, see waves.json
+    :return: dict round number -> Wave
+    """
+    patterns = {name: _compile_runs(runs, f"pattern {name}")
+                for name, runs in spec.get("patterns", {}).items()}
+    compiled = {}
+    for key, data in spec.get("waves", {}).items():
+        where = f"wave {key}"
+        try:
+            round_number = int(key)
+        except ValueError:
+            raise WaveSpecError(f"{where}: round must be a number") from None
+        runs = data.get("runs")
+        if isinstance(runs, str):
+            if runs not in patterns:
+                raise WaveSpecError(f"{where}: unknown pattern {runs!r}")
+            runs = patterns[runs]
+        else:
+            runs = _compile_runs(runs, where)
+        rush = data.get("rush")
+        rush_args = {}
+        if rush is not None:
+            rush_args = {"rush_start": _check_count(rush.get("start"), f"{where} rush start"),
+                         "rush_count": _check_count(rush.get("count"), f"{where} rush count", allow_none=True),
+                         "rush_interval": _check_interval(rush.get("interval"), f"{where} rush interval")}
+        compiled[round_number] = Wave(round_number, _check_interval(data.get("interval"), f"{where} interval"),
+                                      _check_count(data.get("size"), f"{where} size", allow_none=True),
+                                      runs, **rush_args)
+    return compiled
+
+
+def load_spec(path: str = SPEC_PATH) -> dict:
+    """Reads and compiles a wave spec file. :return: dict round number -> Wave"""
+    with open(path) as file:
+        return compile_spec(json.load(file))
+
+
+WAVES = load_spec()
+
+
+def _next_event():
+    """Pulls the next spawn event of the current wave."""
+    global spawn_interval, next_enemy
+    spawn_interval, next_enemy = next(wave_events, (0, None))
 
 
 def start_new_wave(round_number: int):
     """Initialize wave settings when a new wave starts."""
-    global enemies, enemies_spawned, wave_size, spawn_interval, last_spawn_time, \
-        trigger_rush, rush_num, rush_speed
-
-    wave_data = {
-        1: {"spawn_interval": 1000, "wave_size": 5, "trigger_rush": -1},
-        2: {"spawn_interval": 1000, "wave_size": 10, "trigger_rush": -1},
-        3: {"spawn_interval": 1000, "wave_size": 15, "trigger_rush": -1},
-        4: {"spawn_interval": 750, "wave_size": 20, "trigger_rush": -1},
-        5: {"spawn_interval": 750, "wave_size": 20, "trigger_rush": 15, "rush_num": 5, "rush_speed": 250},
-        6: {"spawn_interval": 750, "wave_size": 30, "trigger_rush": -1},
-        7: {"spawn_interval": 500, "wave_size": 30, "trigger_rush": -1},
-        8: {"spawn_interval": 500, "wave_size": 45, "trigger_rush": -1},
-        9: {"spawn_interval": 500, "wave_size": 45, "trigger_rush": -1},
-        10: {"spawn_interval": 500, "wave_size": 50, "trigger_rush": 25, "rush_num": 10, "rush_speed": 250},
-        11: {"spawn_interval": 500, "wave_size": 50, "trigger_rush": -1},
-        12: {"spawn_interval": 500, "wave_size": 50, "trigger_rush": -1},
-        13: {"spawn_interval": 500, "wave_size": 50, "trigger_rush": -1},
-        14: {"spawn_interval": 500, "wave_size": 35, "trigger_rush": -1},
-        15: {"spawn_interval": 500, "wave_size": 50, "trigger_rush": 15, "rush_num": 20, "rush_speed": 150},
-        16: {"spawn_interval": 3500, "wave_size": 3, "trigger_rush": -1},
-        17: {"spawn_interval": 150, "wave_size": 100, "trigger_rush": -1}
-    }
-
-    if round_number in wave_data:
+    global enemies_spawned, wave_size, wave_events, last_spawn_time
+
+    if round_number in WAVES:
         print(f"Starting Wave {round_number}")  # Debugging
-        enemies.clear()
+        game_tools.clear_enemies()
+        wave = WAVES[round_number]
         enemies_spawned = 0
-        wave_size = wave_data[round_number]["wave_size"]
-        spawn_interval = wave_data[round_number]["spawn_interval"]
-        trigger_rush = wave_data[round_number]["trigger_rush"]
-        if trigger_rush != -1:
-            rush_num = wave_data[round_number - 1]["rush_num"]
-            rush_speed = wave_data[round_number - 1]["rush_speed"]
-        last_spawn_time = pygame.time.get_ticks()
+        wave_size = wave.size
+        wave_events = wave.events()
+        _next_event()
+        last_spawn_time = game_tools.get_ticks()
 
 
 def send_wave(scrn: pygame.Surface, round_number: int) -> bool:
-    global enemies, last_spawn_time, enemies_spawned, wave_size, trigger_rush, \
-        rush_speed, rush_num, spawn_interval, waves
-    current_time = pygame.time.get_ticks()
+    global last_spawn_time, enemies_spawned
+    current_time = game_tools.get_ticks()
 
     # Enemy Spawning Logic
-    if trigger_rush != -1:
-        if enemies_spawned >= trigger_rush and (enemies_spawned - trigger_rush <= rush_num):
-            spawn_interval = rush_speed
-    if enemies_spawned < wave_size and current_time - last_spawn_time >= spawn_interval:
-        wave_used = waves[round_number - 1]
+    if next_enemy is not None and current_time - last_spawn_time >= spawn_interval:
         print(f"Spawning Enemy {enemies_spawned + 1}/{wave_size}")  # Debugging
-        print(len(waves))
-        if wave_used[enemies_spawned] == "ANT":
-            ant = AntEnemy((238, 500))
-            enemies.append(ant)
-        elif wave_used[enemies_spawned] == "HORNET":
-            hornet = HornetEnemy((238, 500))
-            enemies.append(hornet)
-        elif wave_used[enemies_spawned] == "CENTIPEDE":
-            centipede = CentipedeEnemy((238, 500), game_tools.house_path)
-            enemies.append(centipede)
-        elif wave_used[enemies_spawned] == "CENTIPEDEBOSS":
-            if enemies_spawned == 0:
-                centipede_boss = CentipedeBoss(enemies_spawned, (238, 500), image_path="assets/centipede_head.png")
-            elif enemies_spawned < 99:
-                centipede_boss = CentipedeBoss(enemies_spawned, (238, 500), image_path="assets/centipede_link.png")
-            else:
-                centipede_boss = CentipedeBoss(enemies_spawned, (238, 500), image_path="assets/centipede_tail.png")
-                centipede_boss.speed = 0.5
-                for e in enemies:
-                    e.speed = 0.5
-            enemies.append(centipede_boss)
+        SPAWNERS[next_enemy](enemies_spawned)
         last_spawn_time = current_time
         enemies_spawned += 1
+        _next_event()
+
+    if scrn is not None:  # headless simulation passes no surface
+        for enemy in enemies:
+            enemy.render(scrn)
+
+    # path-following enemies move together in one batched step per store
+    for escaped in enemy_store.step_all():
+        game_tools.user_health -= escaped.health
 
-    for enemy in enemies[:]:
-        enemy.render(scrn)
-        enemy.move()
+    # back to front, so the enemy swapped into a removed one's place has already been handled
+    for index in range(len(enemies) - 1, -1, -1):
+        enemy = enemies[index]
+        if not isinstance(enemy, Enemy):
+            enemy.move()
         if not enemy.is_alive:
             enemies.remove(enemy)
+            if isinstance(enemy, Enemy):
+                enemy.despawn()
 
-    if enemies_spawned >= wave_size and not enemies:
+    if next_enemy is None and not enemies:
         print(f"Wave {round_number} Complete!")  # Debugging
         game_tools.money += (150 * math.floor(math.log(2, round_number + 1)))
         return True